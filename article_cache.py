@@ -0,0 +1,73 @@
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+
+_ARTICLE_PATH = re.compile(r'/article/(?:\w+/)?(\d{3})/(\d{10})')
+
+
+def article_key(url):
+    # 같은 기사라도 링크 형태가 여러 가지이므로 oid/aid 로 정규화한다
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    if 'oid' in query and 'aid' in query:
+        return f"{query['oid'][0]}/{query['aid'][0]}"
+    m = _ARTICLE_PATH.search(parsed.path)
+    if m:
+        return f"{m.group(1)}/{m.group(2)}"
+    return f"{parsed.netloc}{parsed.path}?{parsed.query}"
+
+
+class ArticleCache:
+    def __init__(self, path='data_news/article_cache.sqlite', maxsize=2048):
+        self.path = path
+        self.maxsize = maxsize
+        self.memory = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._conn = None
+
+    @property
+    def conn(self):
+        # Pool 워커마다 자기 연결을 연다 (fork 이후 연결 공유 금지)
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS articles (key TEXT PRIMARY KEY, content TEXT, fetched_at REAL)')
+        return self._conn
+
+    def _remember(self, key, content):
+        self.memory[key] = content
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def get(self, url):
+        key = article_key(url)
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.memory_hits += 1
+            return self.memory[key]
+        row = self.conn.execute('SELECT content FROM articles WHERE key = ?', (key,)).fetchone()
+        if row is not None:
+            self.disk_hits += 1
+            self._remember(key, row[0])
+            return row[0]
+        self.misses += 1
+        return None
+
+    def put(self, url, content):
+        key = article_key(url)
+        self._remember(key, content)
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO articles VALUES (?, ?, ?)', (key, content, time.time()))
+
+    def stats(self):
+        return {'memory_hits': self.memory_hits, 'disk_hits': self.disk_hits, 'misses': self.misses}
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,128 @@
+import asyncio
+import time
+from urllib.parse import urlparse
+
+import aiohttp
+
+from http_cache import FetchResult
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncFetcher:
+    # 전역 세마포어로 동시 요청 수를, 호스트별 토큰 버킷으로 초당 요청 수를 제한한다
+    def __init__(self, headers=None, concurrency=8, per_host_rate=2.0, burst=2, max_retries=5,
+                 timeout=30, process_id=None, limiter=None, metrics=None):
+        self.headers = headers or {}
+        self.concurrency = concurrency
+        self.per_host_rate = per_host_rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.process_id = process_id
+        self.limiter = limiter
+        self.metrics = metrics
+        self.loop = asyncio.new_event_loop()
+        self.session = None
+        self.semaphore = None
+        self.buckets = {}
+
+    def _log(self, message):
+        prefix = f"[Process {self.process_id}] " if self.process_id is not None else ""
+        print(f"{prefix}{message}")
+
+    def _bucket(self, url):
+        host = urlparse(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.per_host_rate, self.burst)
+        return self.buckets[host]
+
+    async def _ensure_session(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def fetch(self, url, headers=None):
+        await self._ensure_session()
+        wait = 1
+        for _ in range(self.max_retries):
+            try:
+                # 공유 limiter 가 있으면 호스트별 토큰 버킷 대신 워커 전체의 속도를 따른다
+                throttle_started = time.monotonic()
+                if self.limiter is not None:
+                    await asyncio.sleep(self.limiter.reserve())
+                else:
+                    await self._bucket(url).acquire()
+                async with self.semaphore:
+                    started = time.monotonic()
+                    if self.metrics is not None:
+                        self.metrics.observe('throttle', started - throttle_started)
+                        self.metrics.count('requests')
+                    async with self.session.get(url, headers=headers) as resp:
+                        if self.limiter is not None:
+                            self.limiter.report(time.monotonic() - started, resp.status)
+                        resp.raise_for_status()
+                        text = await resp.text()
+                        return FetchResult(str(resp.url), resp.status, text, dict(resp.headers))
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                if self.metrics is not None:
+                    self.metrics.count('retries')
+                if self.limiter is not None:
+                    if not isinstance(e, aiohttp.ClientResponseError):
+                        self.limiter.report(error=True)
+                    self._log(f"Connection error: {e}. Retrying after shared backoff...")
+                    continue
+                self._log(f"Connection error: {e}. Retrying in {wait} seconds...")
+                await asyncio.sleep(wait)
+                wait *= 2
+            except Exception as e:
+                # 디코딩 오류처럼 다시 시도해도 소용없는 오류는 이 URL 만 실패로 돌린다 (같은 배치의 다른 기사는 살린다)
+                if self.metrics is not None:
+                    self.metrics.count('failures')
+                self._log(f"Unexpected error fetching {url}: {e!r}. Giving up on this URL.")
+                return None
+        if self.metrics is not None:
+            self.metrics.count('failures')
+        self._log(f"Failed to fetch data from {url} after {self.max_retries} attempts.")
+        return None
+
+    async def fetch_many(self, urls, headers=None):
+        headers = headers or [None] * len(urls)
+        results = await asyncio.gather(*(self.fetch(url, h) for url, h in zip(urls, headers)), return_exceptions=True)
+        return [None if isinstance(r, BaseException) else r for r in results]
+
+    # 동기 코드(NaverNewsScraper)에서 바로 쓰는 진입점. headers 는 요청별 추가 헤더(조건부 요청 등)
+    def get(self, url, headers=None):
+        return self.loop.run_until_complete(self.fetch(url, headers))
+
+    def get_many(self, urls, headers=None):
+        if not urls:
+            return []
+        return self.loop.run_until_complete(self.fetch_many(urls, headers))
+
+    def close(self):
+        if self.session is not None:
+            self.loop.run_until_complete(self.session.close())
+            self.session = None
+        self.loop.close()
@@ -0,0 +1,82 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from news_parser import PARSERS, get_parser
+
+FIXTURES = os.path.join(ROOT, 'bench', 'fixtures')
+GOLDEN = os.path.join(FIXTURES, 'golden.json')
+
+
+def load_fixtures():
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            fixtures[os.path.basename(path)] = f.read()
+    return fixtures
+
+
+def parse(parser, name, html):
+    if name.startswith('list_'):
+        page = parser.parse_list_page(html)
+        return {'items': [list(item) for item in page.items],
+                'pager': [page.current_page, page.last_page, page.has_next]}
+    return parser.parse_article(html)
+
+
+def update_golden(fixtures):
+    # 골든 출력은 기존 BeautifulSoup 경로의 결과로 만든다
+    parser = get_parser('bs4')
+    golden = {name: parse(parser, name, html) for name, html in fixtures.items()}
+    with open(GOLDEN, 'w', encoding='utf-8') as f:
+        json.dump(golden, f, ensure_ascii=False, indent=1)
+    print(f"Wrote golden outputs for {len(golden)} fixtures to {GOLDEN}")
+
+
+def check_golden(fixtures, backends):
+    with open(GOLDEN, encoding='utf-8') as f:
+        golden = json.load(f)
+    failed = False
+    for backend in backends:
+        parser = get_parser(backend)
+        for name, html in fixtures.items():
+            if parse(parser, name, html) != golden.get(name):
+                print(f"MISMATCH {backend}: {name}")
+                failed = True
+    return not failed
+
+
+def bench(fixtures, backends, seconds):
+    for kind in ('list_', 'article_'):
+        pages = [(name, html) for name, html in fixtures.items() if name.startswith(kind)]
+        for backend in backends:
+            parser = get_parser(backend)
+            count = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < seconds:
+                for name, html in pages:
+                    parse(parser, name, html)
+                count += len(pages)
+            elapsed = time.perf_counter() - start
+            print(f"{kind.rstrip('_'):>8} {backend:>10}: {count / elapsed:8.1f} pages/sec")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Golden-output check and microbenchmark for the HTML parser backends")
+    ap.add_argument('--backends', nargs='+', default=list(PARSERS))
+    ap.add_argument('--seconds', type=float, default=1.0)
+    ap.add_argument('--update-golden', action='store_true')
+    args = ap.parse_args()
+
+    fixtures = load_fixtures()
+    if args.update_golden:
+        update_golden(fixtures)
+    if not check_golden(fixtures, args.backends):
+        sys.exit(1)
+    print("All backends match the golden outputs.")
+    bench(fixtures, args.backends, args.seconds)
@@ -0,0 +1,271 @@
+import argparse
+import html
+import itertools
+import json
+import os
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURES = os.path.join(ROOT, 'bench', 'fixtures')
+RESULTS = os.path.join(ROOT, 'bench', 'results', 'bench_scraper.jsonl')
+START_DATE = datetime(2015, 1, 5)
+ITEMS_PER_PAGE = 20
+SYLLABLES = [chr(c) for c in range(0xAC00, 0xAC00 + 600)]
+
+
+def _read(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+class StubNaver:
+    # 녹화한 목록/기사 HTML 을 틀로 써서 날짜마다 pages 페이지짜리 목록을 만들어 준다.
+    #   - 목록: ul.type02 li 구조와 div.paging 페이저(10개 묶음, a.next)를 실제와 같게 낸다
+    #   - 범위를 벗어난 페이지 번호에는 Naver 처럼 마지막 페이지를 다시 준다
+    #   - 기사: article#dic_area 틀에 기사 ID 로 시드를 준 본문을 붙여 기사마다 본문이 다르다
+    # latency(초, ±50% 흔들림)와 error_rate(503 비율)로 느린/불안정한 서버를 흉내 낸다.
+    def __init__(self, pages=5, latency=0.0, error_rate=0.0, seed=0):
+        self.pages = pages
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {'list': 0, 'article': 0, 'errors': 0}
+
+        list_html = _read('list_20150105_p1.html')
+        self.list_head = list_html[:list_html.index('<li>')]
+        self.list_tail = list_html[list_html.index('<div class="paging">'):]
+        self.list_tail = self.list_tail[self.list_tail.index('</div>') + len('</div>'):]
+        self.items_close = list_html[list_html.rindex('</li>') + len('</li>'):list_html.index('<div class="paging">')]
+        self.titles = [html.unescape(t) for t in re.findall(r'class="nclicks\(fls.list\)">([^<]*)</a>', list_html)]
+        article = _read('article_001_0000000100.html')
+        self.article_head, self.article_tail = article.split('gildong@yna.co.kr')
+
+    def start(self, port=0):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f'http://127.0.0.1:{self.server.server_address[1]}'
+        return self.base
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handle(self, req):
+        url = urlparse(req.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        kind = 'list' if url.path.endswith('list.naver') else 'article'
+        with self.lock:
+            self.counts[kind] += 1
+            fail = self.random.random() < self.error_rate
+            delay = self.latency * self.random.uniform(0.5, 1.5)
+            if fail:
+                self.counts['errors'] += 1
+        if delay:
+            time.sleep(delay)
+        if fail:
+            req.send_response(503)
+            req.end_headers()
+            return
+        body = self.list_page(query) if kind == 'list' else self.article_page(query)
+        data = body.encode('utf-8')
+        req.send_response(200)
+        req.send_header('Content-Type', 'text/html; charset=utf-8')
+        req.send_header('Content-Length', str(len(data)))
+        req.end_headers()
+        req.wfile.write(data)
+
+    def list_page(self, query):
+        date = query.get('date', START_DATE.strftime('%Y%m%d'))
+        page = min(max(int(query.get('page', 1)), 1), self.pages)
+        items = []
+        for i in range(ITEMS_PER_PAGE):
+            n = (page - 1) * ITEMS_PER_PAGE + i
+            aid = f'{int(date) % 100000:05d}{n:05d}'
+            minutes = 23 * 60 + 59 - n % (24 * 60)
+            hour, minute = divmod(minutes, 60)
+            ampm = '오전' if hour < 12 else '오후'
+            # 제목 뒤에 날짜-번호를 붙여 제목 중복 제거에 걸리지 않게 한다 (괄호 안은 정규화에서 지워진다)
+            title = f'{self.titles[n % len(self.titles)]} {date}-{n}'
+            items.append(
+                f'<li>\n\t\t\t\t<a href="{self.base}/main/read.naver?mode=LS2D&amp;mid=sec&amp;sid1=101&amp;sid2=258'
+                f'&amp;oid=001&amp;aid={aid}" class="nclicks(fls.list)">{html.escape(title)}</a>\n'
+                f'\t\t\t\t<span class="writing">연합뉴스</span>\n'
+                f'\t\t\t\t<span class="date">{date[:4]}.{date[4:6]}.{date[6:]}. {ampm} {(hour - 1) % 12 + 1}:{minute:02d}</span>\n'
+                f'\t\t\t</li>'
+            )
+        block = (page - 1) // 10 * 10
+        numbers = []
+        for p in range(block + 1, min(block + 10, self.pages) + 1):
+            numbers.append(f'<strong>{p}</strong>' if p == page else
+                           f'<a href="?date={date}&amp;page={p}" class="nclicks(fls.page)">{p}</a>')
+        if block + 10 < self.pages:
+            numbers.append(f'<a href="?date={date}&amp;page={block + 11}" class="next nclicks(fls.page)">다음</a>')
+        paging = '<div class="paging">\n\t\t\t' + ' '.join(numbers) + '\n\t\t</div>'
+        return self.list_head + '\n\t\t\t'.join(items) + self.items_close + paging + self.list_tail
+
+    def article_page(self, query):
+        # 기사 ID 로 시드를 준 가짜 문장을 붙여 중복 제거(MinHash)가 서로 다른 기사로 보게 한다
+        rng = random.Random(query.get('aid', ''))
+        text = ''.join(rng.choice(SYLLABLES) + (' ' if rng.random() < 0.25 else '') for _ in range(800))
+        return self.article_head + text + '<br>\ngildong@yna.co.kr' + self.article_tail
+
+
+def run_one(config):
+    # 자식 프로세스에서 한 설정을 끝까지 돌린다. 워커들의 CPU/최대 RSS 는 RUSAGE_CHILDREN 으로 잰다
+    import multiprocessing
+
+    import news_engine as scraper
+    from day_scheduler import make_units, month_periods, run_units
+    from rate_limiter import AdaptiveRateLimiter
+    from scrape_metrics import MetricsExporter
+
+    workdir = tempfile.mkdtemp(prefix='bench_scraper_')
+    os.chdir(workdir)
+    os.makedirs('data_news_all', exist_ok=True)
+    start = START_DATE
+    end = start + timedelta(days=config['days'] - 1)
+    periods = month_periods(start, end)
+    units = make_units(periods)
+    settings = scraper.mode_settings(
+        'all', fetch_mode=config['fetch_mode'], parser=config['parser'], start_delay=(0, 0), news_host=config['base_url'],
+    )
+    scraper._settings = settings
+    scraper._exporter = MetricsExporter()
+    limiter = AdaptiveRateLimiter(initial_rate=config['rate'], min_rate=1.0, max_rate=config['rate'] * 4,
+                                  target_latency=max(2.0, config['latency'] * 4), penalty=0.5, cooldown=1.0)
+
+    scraper.preload_modules(settings)
+    cpu_before = resource.getrusage(resource.RUSAGE_SELF)
+    started = time.time()
+    with multiprocessing.Pool(processes=config['workers'], initializer=scraper.init_worker,
+                              initargs=(settings, limiter)) as pool:
+        results = run_units(pool, scraper.run_day, units, periods, on_month_done=scraper.compact_month,
+                            exporter=scraper._exporter)
+        pool.close()
+        pool.join()
+    wall = time.time() - started
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    counters = scraper._exporter.metrics.counters
+    return {
+        'wall_seconds': wall,
+        'pages': sum(r['pages'] for r in results),
+        'articles': counters.get('articles', 0),
+        'requests': counters.get('requests', 0),
+        'retries': counters.get('retries', 0),
+        'pages_per_sec': sum(r['pages'] for r in results) / wall,
+        'articles_per_sec': counters.get('articles', 0) / wall,
+        'cpu_seconds': (own.ru_utime - cpu_before.ru_utime) + (own.ru_stime - cpu_before.ru_stime)
+                       + children.ru_utime + children.ru_stime,
+        # ru_maxrss 는 리눅스에서 KiB 단위
+        'peak_rss_mb': max(own.ru_maxrss, children.ru_maxrss) / 1024,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def previous_results():
+    # 같은 설정의 가장 최근 결과. 회귀 비교용
+    latest = {}
+    if os.path.exists(RESULTS):
+        with open(RESULTS, encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                latest[config_key(record['config'])] = record
+    return latest
+
+
+def config_key(config):
+    return tuple(config[k] for k in ('workers', 'parser', 'fetch_mode', 'days', 'pages', 'latency', 'error_rate', 'rate'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end scraper benchmark against a local Naver stub server')
+    parser.add_argument('--workers', default='1,4', help='comma-separated Pool sizes')
+    parser.add_argument('--parsers', default='lxml', help='comma-separated parser backends')
+    parser.add_argument('--fetch-modes', default='async,sync', help='comma-separated fetch modes')
+    parser.add_argument('--days', type=int, default=4)
+    parser.add_argument('--pages', type=int, default=5, help='list pages per day')
+    parser.add_argument('--latency', type=float, default=0.05, help='mean stub response latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    parser.add_argument('--rate', type=float, default=200.0, help='initial shared request rate (req/s)')
+    parser.add_argument('--no-save', action='store_true', help='do not append results to bench/results')
+    parser.add_argument('--run-one', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        print('BENCH_RESULT ' + json.dumps(run_one(json.loads(args.run_one))))
+        return
+
+    previous = previous_results()
+    commit = git_commit()
+    rows = []
+    matrix = itertools.product([int(w) for w in args.workers.split(',')], args.parsers.split(','),
+                               args.fetch_modes.split(','))
+    for workers, parser_name, fetch_mode in matrix:
+        stub = StubNaver(pages=args.pages, latency=args.latency, error_rate=args.error_rate)
+        base = stub.start()
+        config = {'workers': workers, 'parser': parser_name, 'fetch_mode': fetch_mode, 'days': args.days,
+                  'pages': args.pages, 'latency': args.latency, 'error_rate': args.error_rate, 'rate': args.rate}
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--run-one', json.dumps(dict(config, base_url=base))],
+                              capture_output=True, text=True)
+        stub.stop()
+        line = next((l for l in proc.stdout.splitlines() if l.startswith('BENCH_RESULT ')), None)
+        if line is None:
+            print(f"{config} failed:\n{proc.stderr[-2000:]}")
+            continue
+        result = json.loads(line[len('BENCH_RESULT '):])
+        result['stub_requests'] = dict(stub.counts)
+        record = {'timestamp': datetime.now().isoformat(timespec='seconds'), 'commit': commit,
+                  'config': config, 'result': result}
+        before = previous.get(config_key(config))
+        change = ''
+        if before:
+            delta = result['pages_per_sec'] / before['result']['pages_per_sec'] - 1
+            change = f"{delta:+.1%} vs {before['commit']}"
+        rows.append((config, result, change))
+        if not args.no_save:
+            os.makedirs(os.path.dirname(RESULTS), exist_ok=True)
+            with open(RESULTS, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    print(f"{'workers':>7} {'parser':>10} {'fetch':>6} {'wall s':>7} {'pages/s':>8} {'arts/s':>8} {'cpu s':>7} "
+          f"{'rss MB':>7} {'reqs':>6} {'retry':>6}  change")
+    for config, r, change in rows:
+        print(f"{config['workers']:>7} {config['parser']:>10} {config['fetch_mode']:>6} {r['wall_seconds']:>7.2f} "
+              f"{r['pages_per_sec']:>8.1f} {r['articles_per_sec']:>8.1f} {r['cpu_seconds']:>7.2f} "
+              f"{r['peak_rss_mb']:>7.1f} {r['requests']:>6} {r['retries']:>6}  {change}")
+
+
+if __name__ == '__main__':
+    main()
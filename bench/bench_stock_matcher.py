@@ -0,0 +1,64 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stock_matcher import StockMatcher
+
+SYLLABLES = "삼성전자현대차기아엘지화학에스케이하이닉스포스코네이버카카오셀트리온한화롯데신한금융"
+
+
+def make_universe(n, seed=0):
+    rng = random.Random(seed)
+    codes, names = [], []
+    for i in range(n):
+        codes.append(f"{i * 37 % 1000000:06d}")
+        names.append(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 6))))
+    # 부분 문자열 관계인 종목명도 섞어 둔다
+    codes += ['900001', '900002']
+    names += ['삼성', '삼성전자']
+    return codes, names
+
+
+def make_titles(names, n, seed=1):
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(n):
+        filler = ''.join(rng.choice(SYLLABLES + ' ,.') for _ in range(rng.randint(20, 40)))
+        if rng.random() < 0.3:
+            pos = rng.randint(0, len(filler))
+            filler = filler[:pos] + rng.choice(names) + filler[pos:]
+        titles.append(filler)
+    return titles
+
+
+def zip_loop(codes, names, title):
+    return [(code, name) for code, name in zip(codes, names) if code in title or name in title]
+
+
+def bench(n_stocks, n_titles):
+    codes, names = make_universe(n_stocks)
+    titles = make_titles(names, n_titles)
+
+    t0 = time.perf_counter()
+    matcher = StockMatcher(codes, names)
+    build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    expected = [zip_loop(codes, names, t) for t in titles]
+    loop_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    actual = [matcher.find(t) for t in titles]
+    ac_time = time.perf_counter() - t0
+
+    assert expected == actual, "matcher output differs from zip loop"
+    print(f"{n_stocks:>5} stocks x {n_titles} titles: "
+          f"zip loop {loop_time:.3f}s, automaton {ac_time:.3f}s (build {build:.3f}s), "
+          f"speedup {loop_time / ac_time:.1f}x")
+
+
+if __name__ == "__main__":
+    for n in (950, 2700):
+        bench(n, 5000)
@@ -0,0 +1,106 @@
+import argparse
+import csv
+import glob
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from news_store import NewsStore, compact_store
+
+COLUMNS = ['시간', '종목명', '종목코드', '제목', '내용']
+SYLLABLES = '가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호'
+
+
+def make_archive(directory, months, rows_per_month, stocks, body_chars, seed=0):
+    # CsvSink 가 남기는 것과 같은 월별 파일(시간 역순, UTF-8-SIG)을 합성한다
+    rng = random.Random(seed)
+    codes = [f'{i:06d}' for i in range(5930, 5930 + stocks)]
+    names = [f'종목{i}' for i in range(stocks)]
+    start = datetime(2015, 1, 1)
+    for month in range(months):
+        first = datetime(start.year + (start.month - 1 + month) // 12, (start.month - 1 + month) % 12 + 1, 1)
+        last = (first.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        seconds = int((last - first).total_seconds()) + 86399
+        rows = []
+        for n in range(rows_per_month):
+            s = rng.randrange(stocks)
+            title = f'{names[s]} {rng.choice(SYLLABLES)}{rng.choice(SYLLABLES)} 기사 {month}-{n}'
+            body = ''.join(rng.choice(SYLLABLES) for _ in range(body_chars))
+            rows.append((first + timedelta(seconds=rng.randrange(seconds) // 60 * 60), names[s], codes[s], title, body))
+        rows.sort(key=lambda r: r[0], reverse=True)
+        path = os.path.join(directory, f'news_{first:%Y-%m-%d}_to_{last:%Y-%m-%d}_proc_{month}.csv')
+        with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            writer.writerows((str(r[0]), *r[1:]) for r in rows)
+    return codes
+
+
+def pandas_scan(directory, code, low, high):
+    # 지금까지의 방식: 모든 월 파일을 glob 해서 pandas 로 전부 읽고 거른다
+    import pandas as pd
+    frames = [pd.read_csv(p, dtype=str, encoding='utf-8-sig') for p in sorted(glob.glob(os.path.join(directory, 'news_*.csv')))]
+    df = pd.concat(frames, ignore_index=True)
+    times = pd.to_datetime(df['시간'])
+    return df[(df['종목코드'] == code) & (times >= low) & (times <= high)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Full CSV scan vs. month-partitioned Parquet store for a one-stock, one-week lookup')
+    ap.add_argument('--months', type=int, default=12)
+    ap.add_argument('--rows', type=int, default=20000, help='rows per month')
+    ap.add_argument('--stocks', type=int, default=900)
+    ap.add_argument('--body', type=int, default=400, help='body length in characters')
+    ap.add_argument('--repeat', type=int, default=20)
+    args = ap.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='bench_store_')
+    try:
+        codes = make_archive(directory, args.months, args.rows, args.stocks, args.body)
+        csv_mb = sum(os.path.getsize(p) for p in glob.glob(os.path.join(directory, '*.csv'))) / 2 ** 20
+        code = codes[len(codes) // 2]
+        low, high = datetime(2015, 3, 2), datetime(2015, 3, 8, 23, 59, 59)
+
+        started = time.perf_counter()
+        expected = pandas_scan(directory, code, low, high)
+        scan_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        store_dir = compact_store(directory)
+        compact_seconds = time.perf_counter() - started
+        store_mb = sum(os.path.getsize(p) for p in glob.glob(os.path.join(store_dir, 'month=*', '*.parquet'))) / 2 ** 20
+
+        store = NewsStore(store_dir)
+        started = time.perf_counter()
+        table = store.query(low, high, code)
+        cold_ms = (time.perf_counter() - started) * 1000
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            store.query(low, high, code)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        if table.num_rows != len(expected):
+            print(f"MISMATCH: store returned {table.num_rows} rows, full scan {len(expected)}")
+            sys.exit(1)
+
+        print(f"archive: {args.months} months x {args.rows} rows, CSV {csv_mb:.1f} MiB -> store {store_mb:.1f} MiB "
+              f"(compaction {compact_seconds:.1f}s)")
+        print(f"lookup {code} {low:%Y-%m-%d}..{high:%Y-%m-%d}: {table.num_rows} rows")
+        print(f"  full CSV scan (pandas) : {scan_seconds * 1000:9.1f} ms")
+        print(f"  store, first query     : {cold_ms:9.1f} ms")
+        print(f"  store, median of {args.repeat:<3}   : {timings[len(timings) // 2]:9.1f} ms "
+              f"(read {store.last_scan['row_groups_read']}/{store.last_scan['row_groups']} row groups "
+              f"from {store.last_scan['files']} month files)")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+from aiohttp import web
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from async_fetch import AsyncFetcher
+
+
+class StubServer:
+    # 로컬 aiohttp 서버. 요청 시각과 동시에 처리 중인 요청 수를 기록한다.
+    #   /slow?ms=N     : N ms 뒤에 응답
+    #   /flaky?key=K&n=N : 키마다 처음 N 번은 503, 그다음부터 200
+    #   /down          : 항상 503
+    #   /bad           : charset=utf-8 이라고 하고 UTF-8 이 아닌 바이트를 보낸다
+    def __init__(self):
+        self.hits = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.failures = {}
+
+    async def handle(self, request):
+        self.hits.append((time.monotonic(), request.path))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if request.path == '/slow':
+                await asyncio.sleep(int(request.query.get('ms', 0)) / 1000)
+            elif request.path == '/flaky':
+                key = request.query['key']
+                self.failures[key] = self.failures.get(key, 0) + 1
+                if self.failures[key] <= int(request.query['n']):
+                    return web.Response(status=503)
+            elif request.path == '/down':
+                return web.Response(status=503)
+            elif request.path == '/bad':
+                return web.Response(body=b'\xff\xfe broken', content_type='text/html', charset='utf-8')
+            return web.Response(text=f'ok {request.path_qs}', content_type='text/html')
+        finally:
+            self.in_flight -= 1
+
+    def start(self):
+        app = web.Application()
+        app.router.add_get('/{name}', self.handle)
+        self.loop = asyncio.new_event_loop()
+        self.runner = web.AppRunner(app)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        self.loop.run_until_complete(site.start())
+        port = site._server.sockets[0].getsockname()[1]
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        return f'http://127.0.0.1:{port}'
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def reset(self):
+        self.hits = []
+        self.max_in_flight = 0
+
+
+def check(name, ok, detail):
+    print(f"{'PASS' if ok else 'FAIL'} {name}: {detail}")
+    return ok
+
+
+def check_concurrency(server, base):
+    server.reset()
+    fetcher = AsyncFetcher(concurrency=4, per_host_rate=1000.0, burst=1000)
+    results = fetcher.get_many([f'{base}/slow?ms=200&i={i}' for i in range(16)])
+    fetcher.close()
+    return check('concurrency cap', server.max_in_flight == 4 and all(results),
+                 f'{server.max_in_flight} requests in flight at most (cap 4), {sum(map(bool, results))}/16 ok')
+
+
+def check_host_rate(server, base):
+    # 버스트 2 개 뒤로는 초당 10 개를 넘지 않아야 한다: 12 개면 첫 요청과 마지막 요청 사이가 1 초 이상
+    server.reset()
+    fetcher = AsyncFetcher(concurrency=16, per_host_rate=10.0, burst=2)
+    results = fetcher.get_many([f'{base}/slow?i={i}' for i in range(12)])
+    fetcher.close()
+    times = sorted(t for t, _ in server.hits)
+    span = times[-1] - times[0]
+    over = [i for i in range(2, len(times)) if times[i] - times[0] < (i - 2) / 10.0 * 0.9]
+    return check('per-host rate', span >= 0.9 and not over and all(results),
+                 f'12 requests spread over {span:.2f}s at 10/s with burst 2, {len(over)} early')
+
+
+def check_retry(server, base):
+    server.reset()
+    fetcher = AsyncFetcher(concurrency=4, per_host_rate=1000.0, burst=1000, max_retries=3)
+    recovered, down = fetcher.get_many([f'{base}/flaky?key=a&n=2', f'{base}/down'])
+    fetcher.close()
+    down_hits = sum(1 for _, path in server.hits if path == '/down')
+    flaky_hits = sum(1 for _, path in server.hits if path == '/flaky')
+    return check('retry then None', recovered is not None and recovered.status_code == 200 and down is None
+                 and down_hits == 3 and flaky_hits == 3,
+                 f'flaky recovered on attempt {flaky_hits}, always-503 gave {down!r} after {down_hits} attempts')
+
+
+def check_bad_body(server, base):
+    # 본문 하나를 디코딩하지 못해도 같은 배치의 다른 응답은 살아 있어야 한다
+    server.reset()
+    fetcher = AsyncFetcher(concurrency=4, per_host_rate=1000.0, burst=1000)
+    results = fetcher.get_many([f'{base}/slow?i=0', f'{base}/bad', f'{base}/slow?i=1'])
+    fetcher.close()
+    return check('undecodable body', results[0] is not None and results[1] is None and results[2] is not None,
+                 f'results {[None if r is None else r.status_code for r in results]}, /bad requested '
+                 f'{sum(1 for _, path in server.hits if path == "/bad")} time(s)')
+
+
+if __name__ == "__main__":
+    server = StubServer()
+    base = server.start()
+    try:
+        passed = [c(server, base) for c in (check_concurrency, check_host_rate, check_retry, check_bad_body)]
+    finally:
+        server.stop()
+    if not all(passed):
+        sys.exit(1)
+    print("AsyncFetcher checks passed.")
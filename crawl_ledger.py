@@ -0,0 +1,61 @@
+import json
+import sqlite3
+import time
+
+
+class CrawlLedger:
+    # 완료한 (날짜, 페이지)를 기록해 두었다가, 재시작하면 그 다음 페이지부터 이어간다.
+    # 페이지의 행은 기록 전에 sink 로 flush 되므로 월 파일이 저장되기 전에 죽어도 잃지 않는다.
+    # articles 에는 실제로 본문을 받은 기사만 남긴다 (중복 검사로 건너뛴 기사, 받지 못한 기사는 빠진다).
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS pages (
+                    date TEXT, page INTEGER, titles TEXT, done_at REAL,
+                    PRIMARY KEY (date, page)
+                );
+                CREATE TABLE IF NOT EXISTS days (date TEXT PRIMARY KEY, done_at REAL);
+                CREATE TABLE IF NOT EXISTS articles (article_id TEXT PRIMARY KEY, date TEXT, fetched_at REAL);
+            ''')
+        return self._conn
+
+    def day_state(self, date):
+        finished = self.conn.execute('SELECT 1 FROM days WHERE date = ?', (date,)).fetchone() is not None
+        row = self.conn.execute(
+            'SELECT page, titles FROM pages WHERE date = ? ORDER BY page DESC LIMIT 1', (date,)
+        ).fetchone()
+        if row is None:
+            return finished, 0, None
+        return finished, row[0], json.loads(row[1])
+
+    def record_page(self, date, page, titles, article_ids=()):
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO pages (date, page, titles, done_at) VALUES (?, ?, ?, ?)',
+                (date, page, json.dumps(titles, ensure_ascii=False), now),
+            )
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO articles VALUES (?, ?, ?)',
+                [(article_id, date, now) for article_id in article_ids],
+            )
+
+    def fetched_ids(self, date):
+        # 그 날짜에서 본문을 받아 출력한 기사 ID. 이어받을 때 같은 기사를 다시 받지 않는다
+        return {row[0] for row in self.conn.execute('SELECT article_id FROM articles WHERE date = ?', (date,))}
+
+    def finish_day(self, date):
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO days VALUES (?, ?)', (date, time.time()))
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,74 @@
+import calendar
+import time
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta
+
+# 작업 단위는 한 섹션의 하루. month 는 결과 파일을 묶을 월 구간의 인덱스(기존 proc 번호와 같다)
+WorkUnit = namedtuple('WorkUnit', ['date', 'month', 'section'], defaults=[None])
+
+
+def month_periods(start_date, end_date):
+    periods = []
+    current_start = start_date
+    while current_start <= end_date:
+        year, month = current_start.year, current_start.month
+        last_day_of_month = calendar.monthrange(year, month)[1]
+        current_end = datetime(year, month, last_day_of_month)
+        if current_end > end_date:
+            current_end = end_date
+        periods.append((current_start, current_end))
+        current_start = current_end + timedelta(days=1)
+    return periods
+
+
+def make_units(periods, sections=(None,)):
+    units = []
+    for month, (start, end) in enumerate(periods):
+        day = start
+        while day <= end:
+            units.extend(WorkUnit(day, month, section) for section in sections)
+            day += timedelta(days=1)
+    # 섹션별로 차례로 돈다. 같은 날짜의 다른 섹션이 동시에 돌지 않아야 공유 중복 색인이 앞 섹션에서 받은 기사를 건너뛴다.
+    # 섹션 안에서는 월 순서대로 돌아 월 파일이 하나씩 닫히게 하고(run 파일이 쌓이지 않고, 죽어도 끝난 달은 남는다),
+    # 한 달 안에서는 기사가 많은 평일을 먼저, 한산한 주말을 나중에 배치해 그 달의 꼬리 지연을 줄인다
+    order = {section: i for i, section in enumerate(sections)}
+    units.sort(key=lambda u: (order[u.section], u.month, u.date.weekday() >= 5, u.date))
+    return units
+
+
+def run_units(pool, worker, units, periods, on_month_done=None, exporter=None):
+    # 워커는 공유 작업 큐에서 하루씩 가져간다 (chunksize=1). 한 달의 모든 날이 끝나면 병합 단계를 호출한다.
+    # 워커가 결과에 실어 보낸 metrics 스냅샷은 exporter 에 합친다.
+    return _collect(pool.imap_unordered(worker, units, chunksize=1), units, periods, on_month_done, exporter)
+
+
+def run_serial(worker, units, periods, on_month_done=None, exporter=None):
+    # 단일 프로세스 모드: 같은 프로세스에서 날짜 순으로 하루씩 돈다. 결과 형식과 병합 시점은 run_units 와 같다
+    ordered = sorted(units, key=lambda u: (u.date, u.section or ''))
+    return _collect(map(worker, ordered), ordered, periods, on_month_done, exporter)
+
+
+def _collect(results_iter, units, periods, on_month_done, exporter):
+    remaining = Counter(u.month for u in units)
+    total = len(units)
+    started = time.time()
+    results = []
+    for done, result in enumerate(results_iter, start=1):
+        if exporter is not None and 'metrics' in result:
+            exporter.update(result.pop('metrics'))
+        results.append(result)
+        elapsed = time.time() - started
+        eta = elapsed / done * (total - done)
+        label = f"{result['date']} {result['section']}" if result.get('section') else result['date']
+        print(f"[Scheduler] {done}/{total} days done ({label}: {result['pages']} pages, "
+              f"{result['elapsed']:.1f}s). Elapsed {elapsed:.0f}s, ETA {eta:.0f}s")
+        remaining[result['month']] -= 1
+        if remaining[result['month']] == 0 and on_month_done is not None:
+            start, end = periods[result['month']]
+            on_month_done(result['month'], start, end)
+
+    pages = sum(r['pages'] for r in results)
+    saved = sum(r.get('requests_saved', 0) for r in results)
+    print(f"[Scheduler] Finished {total} days: {pages} list pages fetched, "
+          f"{saved} end-of-day probe requests saved by reading the pager.")
+    return results
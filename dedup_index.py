@@ -0,0 +1,213 @@
+import csv
+import hashlib
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+_TITLE_TAGS = re.compile(r'\[[^\]]*\]|\([^)]*\)|【[^】]*】|<[^>]*>')
+_NON_WORD = re.compile(r'[\W_]+')
+SHINGLE = 4
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 61) - 1
+_rng = np.random.RandomState(20150101)
+# 모든 워커와 모든 실행이 같은 해시 함수 집합을 쓰도록 시드를 고정한다
+_PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERM).astype(np.uint64)
+FAILED_CONTENTS = ('Failed to retrieve content', 'No content available')
+
+
+def normalize_title(title):
+    # [속보], (종합), 【포토】 같은 말머리와 공백/문장부호를 떼어 통신사 재송고 기사의 제목을 같게 만든다
+    return _NON_WORD.sub('', _TITLE_TAGS.sub('', title)).lower()
+
+
+def minhash(text):
+    # 공백/문장부호를 뺀 본문의 글자 4-gram 집합에 대한 MinHash 서명 (한국어는 형태소 분석 없이 글자 n-gram 이 잘 맞는다)
+    text = _NON_WORD.sub('', text)
+    if len(text) < SHINGLE:
+        return None
+    shingles = {text[i:i + SHINGLE] for i in range(len(text) - SHINGLE + 1)}
+    digests = b''.join(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest() for s in shingles)
+    hashes = np.frombuffer(digests, dtype=np.uint32).astype(np.uint64)
+    # (a * h + b) mod p 를 순열 64개에 대해 한꺼번에 계산한다. a, h < 2^32 이므로 uint64 에서 넘치지 않는다
+    return ((_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _PRIME).min(axis=1)
+
+
+def similarity(a, b):
+    return float(np.mean(a == b))
+
+
+def band_keys(signature):
+    # 서명을 ROWS 개씩 BANDS 개 밴드로 나눠 밴드마다 키 하나. 한 밴드라도 같으면 후보가 된다
+    return [int.from_bytes(hashlib.blake2b(bytes([i]) + signature[i * ROWS:(i + 1) * ROWS].tobytes(),
+                                           digest_size=8).digest(), 'big', signed=True)
+            for i in range(BANDS)]
+
+
+class DedupIndex:
+    # 모든 워커가 공유하는 기사 색인. 기사 ID, 정규화한 제목, 본문 MinHash 서명을 기록한다.
+    #   - 이미 색인에 있는 기사 ID 는 본문을 받기 전에 건너뛴다
+    #   - skip_titles=True 면 가까운 날짜에 같은 정규화 제목이 있는 기사도 받지 않는다. 매일 같은 제목으로 나오는
+    #     시세표 기사('[표] 외국인 순매수 상위 종목' 등)까지 빠지므로 기본은 끈다
+    #   - 본문 서명의 추정 자카드 유사도가 threshold 이상인 기사는 근사 중복으로 보고 dup_of 에 원본 ID 를 남긴다.
+    #     출력에서 빼지 않고, export_duplicates() 로 중복 목록을 따로 낸다
+    # 서명을 밴드로 나눈 키를 bands 테이블에 두어(LSH) 후보만 꺼내 비교한다.
+    # 새 항목은 pending 에 모아 두었다가 sink flush 뒤 commit() 으로 한꺼번에 기록한다 (ledger 와 같은 시점).
+    def __init__(self, path, threshold=0.8, window_days=1, min_body=200, skip_titles=False):
+        self.path = path
+        self.skip_titles = skip_titles
+        self.threshold = threshold
+        self.window_days = window_days
+        self.min_body = min_body
+        self.pending = []
+        self.skipped_known = 0
+        self.skipped_titles = 0
+        self.near_duplicates = 0
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS articles (
+                    article_id TEXT PRIMARY KEY, day TEXT, title TEXT, title_key TEXT,
+                    signature BLOB, dup_of TEXT, added_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS articles_title ON articles (title_key, day);
+                CREATE TABLE IF NOT EXISTS bands (band_key INTEGER, article_id TEXT, PRIMARY KEY (band_key, article_id));
+            ''')
+        return self._conn
+
+    def _window(self, day):
+        d = datetime.strptime(day, '%Y%m%d')
+        delta = timedelta(days=self.window_days)
+        return (d - delta).strftime('%Y%m%d'), (d + delta).strftime('%Y%m%d')
+
+    def known(self, article_ids):
+        ids = list(dict.fromkeys(article_ids))
+        found = {p['article_id'] for p in self.pending if p['article_id'] in ids}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            rows = self.conn.execute(
+                f'SELECT article_id FROM articles WHERE article_id IN ({",".join("?" * len(chunk))})', chunk
+            ).fetchall()
+            found.update(r[0] for r in rows)
+        return found
+
+    def title_duplicate(self, title, day):
+        key = normalize_title(title)
+        if len(key) < 8:
+            # '[포토]' 처럼 말머리를 떼면 거의 남지 않는 제목은 비교하지 않는다
+            return None
+        low, high = self._window(day)
+        for p in self.pending:
+            if p['title_key'] == key and low <= p['day'] <= high:
+                return p['dup_of'] or p['article_id']
+        row = self.conn.execute(
+            'SELECT article_id, dup_of FROM articles WHERE title_key = ? AND day BETWEEN ? AND ? ORDER BY added_at LIMIT 1',
+            (key, low, high),
+        ).fetchone()
+        return (row[1] or row[0]) if row else None
+
+    def near_duplicate(self, signature, day):
+        low, high = self._window(day)
+        keys = band_keys(signature)
+        candidates = [(p['article_id'], p['dup_of'], p['signature']) for p in self.pending
+                      if p['signature'] is not None and low <= p['day'] <= high and set(p['band_keys']) & set(keys)]
+        rows = self.conn.execute(
+            f'SELECT DISTINCT a.article_id, a.dup_of, a.signature FROM bands b JOIN articles a ON a.article_id = b.article_id '
+            f'WHERE b.band_key IN ({",".join("?" * len(keys))}) AND a.day BETWEEN ? AND ? ORDER BY a.added_at',
+            (*keys, low, high),
+        )
+        candidates += [(a, d, np.frombuffer(sig, dtype=np.uint64)) for a, d, sig in rows]
+        for article_id, dup_of, other in candidates:
+            if similarity(signature, other) >= self.threshold:
+                return dup_of or article_id
+        return None
+
+    def screen(self, articles, day):
+        # articles: [(article_id, title), ...]. 본문을 받아야 하는 기사 ID 집합을 돌려준다
+        known = self.known(a for a, _ in articles)
+        keep = set()
+        batch_titles = {}
+        for article_id, title in articles:
+            if article_id in known or article_id in keep:
+                self.skipped_known += 1
+                continue
+            if self.skip_titles:
+                key = normalize_title(title)
+                dup_of = batch_titles.get(key) if len(key) >= 8 else None
+                if dup_of is None:
+                    dup_of = self.title_duplicate(title, day)
+                if dup_of is not None:
+                    self.skipped_titles += 1
+                    self.add(article_id, title, day, dup_of=dup_of)
+                    continue
+                batch_titles.setdefault(key, article_id)
+            keep.add(article_id)
+        return keep
+
+    def add(self, article_id, title, day, body=None, dup_of=None):
+        # 본문이 있으면 MinHash 로 근사 중복을 찾는다. 돌려준 dup_of 가 None 이 아니면 중복 기사다
+        signature = None
+        if body is not None and body not in FAILED_CONTENTS and len(body) >= self.min_body:
+            signature = minhash(body)
+            if dup_of is None and signature is not None:
+                dup_of = self.near_duplicate(signature, day)
+                if dup_of is not None:
+                    self.near_duplicates += 1
+        self.pending.append({
+            'article_id': article_id, 'day': day, 'title': title, 'title_key': normalize_title(title),
+            'signature': signature, 'band_keys': band_keys(signature) if signature is not None else [],
+            'dup_of': dup_of,
+        })
+        return dup_of
+
+    def commit(self):
+        if not self.pending:
+            return
+        now = time.time()
+        articles = []
+        bands = []
+        for p in self.pending:
+            signature = p['signature'].tobytes() if p['signature'] is not None else None
+            articles.append((p['article_id'], p['day'], p['title'], p['title_key'], signature, p['dup_of'], now))
+            # 원본 기사만 밴드에 올린다. 중복 기사는 원본을 통해 찾으면 된다
+            if p['dup_of'] is None:
+                bands.extend((key, p['article_id']) for key in p['band_keys'])
+        with self.conn:
+            self.conn.executemany('INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?)', articles)
+            self.conn.executemany('INSERT OR IGNORE INTO bands VALUES (?, ?)', bands)
+        self.pending = []
+
+    def rollback(self):
+        # 완료로 기록하지 않은 페이지의 항목은 버린다. 다음 실행에서 그 페이지를 다시 본다
+        self.pending = []
+
+    def export_duplicates(self, filepath):
+        # 중복으로 판정된 기사와 원본 기사 ID 목록 (출력 CSV 와 제목으로 맞춰 볼 수 있다)
+        rows = self.conn.execute(
+            'SELECT a.article_id, a.day, a.title, a.dup_of, o.title FROM articles a '
+            'LEFT JOIN articles o ON o.article_id = a.dup_of WHERE a.dup_of IS NOT NULL ORDER BY a.day, a.article_id'
+        )
+        with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(['기사ID', '날짜', '제목', '원본기사ID', '원본제목'])
+            writer.writerows(rows)
+        return filepath
+
+    def stats(self):
+        return {'skipped_known': self.skipped_known, 'skipped_titles': self.skipped_titles,
+                'near_duplicates': self.near_duplicates}
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,127 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+import uuid
+
+MODES = ('revalidate', 'cache-first', 'offline')
+
+
+class FetchResult:
+    # requests.Response 대신 쓸 수 있도록 스크래퍼가 쓰는 속성(url, status_code, text, headers)만 갖춘다.
+    # 캐시에서 읽은 응답과 async_fetch 가 받은 응답이 같이 쓴다
+    def __init__(self, url, status_code, text, headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+class HttpCache:
+    # URL 의 sha256 을 키로 원본 HTML 을 gzip 으로 저장한다.
+    #   revalidate  : 캐시가 있으면 ETag/Last-Modified 로 조건부 요청을 보내고 304 면 캐시를 쓴다
+    #   cache-first : 캐시가 있으면 네트워크 없이 바로 쓴다 (지난 날짜 목록/기사 재수집용)
+    #   offline     : 캐시만 쓰고 없으면 None. 새 종목 목록으로 재추출할 때 네트워크 없이 다시 돌린다
+    def __init__(self, directory, mode='revalidate'):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cache mode: {mode} (choose from {', '.join(MODES)})")
+        self.directory = directory
+        self.mode = mode
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def _paths(self, url):
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, digest[:2], digest)
+        return base + '.html.gz', base + '.json'
+
+    def lookup_meta(self, url):
+        # 검증자(ETag/Last-Modified)와 상태 코드만 담은 작은 .json. 본문은 필요할 때 load() 로 읽는다
+        try:
+            with open(self._paths(url)[1], encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load(self, url, meta):
+        try:
+            with gzip.open(self._paths(url)[0], 'rt', encoding='utf-8') as f:
+                text = f.read()
+        except (OSError, ValueError, EOFError):
+            return None
+        return FetchResult(url, meta['status_code'], text, meta.get('headers'))
+
+    def store(self, url, res):
+        body_path, meta_path = self._paths(url)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        headers = {k: v for k, v in res.headers.items() if k.lower() in ('etag', 'last-modified', 'content-type')}
+        meta = {'url': url, 'status_code': res.status_code, 'headers': headers, 'fetched_at': time.time()}
+        # 다른 워커가 같은 파일을 읽고 있을 수 있으므로 임시 파일에 쓴 뒤 교체한다.
+        # 같은 URL 을 두 워커가 함께 저장할 수 있으므로(두 섹션에 걸린 기사 등) 임시 파일 이름은 쓰는 쪽마다 다르다
+        tmp = f'.{uuid.uuid4().hex}.tmp'
+        with gzip.open(body_path + tmp, 'wt', encoding='utf-8') as f:
+            f.write(res.text)
+        with open(meta_path + tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(body_path + tmp, body_path)
+        os.replace(meta_path + tmp, meta_path)
+
+    def conditional_headers(self, meta):
+        headers = {}
+        if not meta:
+            return headers
+        cached_headers = {k.lower(): v for k, v in meta.get('headers', {}).items()}
+        if 'etag' in cached_headers:
+            headers['If-None-Match'] = cached_headers['etag']
+        if 'last-modified' in cached_headers:
+            headers['If-Modified-Since'] = cached_headers['last-modified']
+        return headers
+
+    def _resolve(self, url, meta, res):
+        if res is None:
+            return None
+        if res.status_code == 304 and meta is not None:
+            # 본문은 서버가 바뀌지 않았다고 답한 뒤에만 푼다
+            cached = self.load(url, meta)
+            if cached is not None:
+                self.revalidated += 1
+            return cached
+        self.store(url, res)
+        return res
+
+    def get(self, url, fetch):
+        # fetch(url, extra_headers) -> 응답 또는 None
+        return self.get_many([url], lambda batch: [fetch(u, h) for u, h in batch])[0]
+
+    def get_many(self, urls, fetch_many):
+        # fetch_many([(url, extra_headers), ...]) -> 응답 목록. 캐시에서 못 채운 URL 만 한꺼번에 요청한다
+        results = {}
+        pending = []
+        for url in dict.fromkeys(urls):
+            # revalidate 에서는 .json 만 읽는다. Naver 는 검증자를 거의 주지 않아 대개 본문을 다시 받기 때문이다
+            meta = self.lookup_meta(url)
+            if meta is not None and self.mode in ('cache-first', 'offline'):
+                cached = self.load(url, meta)
+                if cached is not None:
+                    self.hits += 1
+                    results[url] = cached
+                    continue
+            if self.mode == 'offline':
+                self.misses += 1
+                results[url] = None
+                continue
+            headers = self.conditional_headers(meta)
+            if not headers:
+                self.misses += 1
+            pending.append((url, meta, headers))
+
+        responses = fetch_many([(url, headers) for url, _, headers in pending]) if pending else []
+        for (url, meta, _), res in zip(pending, responses):
+            results[url] = self._resolve(url, meta, res)
+        return [results[url] for url in urls]
+
+    def stats(self):
+        # 기사 캐시의 통계와 run_day 결과에서 섞이지 않도록 http_ 를 붙인다
+        return {'http_hits': self.hits, 'http_revalidated': self.revalidated, 'http_misses': self.misses}
@@ -0,0 +1,197 @@
+import json
+import os
+import queue
+import re
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from article_cache import ArticleCache, article_key
+from async_fetch import AsyncFetcher
+from news_parser import get_parser
+from news_engine import HEADERS, NaverNewsScraper, load_matcher, mode_settings, parse_time
+from rate_limiter import AdaptiveRateLimiter
+
+# Naver 목록의 시각은 한국 시간이다. 서버 시간대와 상관없이 지연을 재도록 KST 로 맞춘다
+KST = timezone(timedelta(hours=9))
+_RELATIVE = re.compile(r'(\d+)\s*(초|분|시간)\s*전')
+
+
+def now_kst():
+    return datetime.now(KST).replace(tzinfo=None)
+
+
+def parse_list_time(date, time_str, now):
+    # 오늘 목록은 '오전 9:01' 대신 '3분전' 처럼 상대 시각으로 나올 때가 있다
+    m = _RELATIVE.search(time_str)
+    if m:
+        unit = {'초': 'seconds', '분': 'minutes', '시간': 'hours'}[m.group(2)]
+        return (now - timedelta(**{unit: int(m.group(1))})).replace(second=0, microsecond=0)
+    return parse_time(date, time_str)
+
+
+class JsonlEmitter:
+    # 이벤트 한 건을 JSON 한 줄로 쓰고 바로 flush 한다. path 가 '-' 이면 표준 출력
+    def __init__(self, path='-'):
+        self.path = path
+        if path != '-' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.file = sys.stdout if path == '-' else open(path, 'a', encoding='utf-8')
+
+    def __call__(self, event):
+        self.file.write(json.dumps(event, ensure_ascii=False, default=str) + '\n')
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class QueueEmitter:
+    # 같은 프로세스의 전략 스레드나 다른 프로세스(multiprocessing.Queue)로 이벤트를 넘긴다
+    def __init__(self, q):
+        self.queue = q
+
+    def __call__(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            print(f"[Follow] Event queue is full. Dropping {event['article_id']}")
+
+
+class LiveFollower:
+    # 오늘 목록 1페이지를 interval 초마다 다시 읽어, 처음 보는 기사 ID 중 종목이 걸린 기사만 본문을 받아 바로 내보낸다.
+    # 1페이지가 전부 새 기사면 폴링 사이에 더 밀려났을 수 있으므로 max_pages 까지 다음 페이지도 읽는다.
+    # 이벤트마다 latency(발행 -> 내보냄, 초)와 detect_latency(발행 -> 목록에서 처음 봄)를 남긴다.
+    def __init__(self, scraper, emit, interval=5.0, max_pages=3, seen_size=5000):
+        self.scraper = scraper
+        self.emit = emit
+        self.interval = interval
+        self.max_pages = max_pages
+        self.seen_size = seen_size
+        self.seen = OrderedDict()
+        self.latencies = []
+        self.polls = 0
+        self.primed = False
+
+    def _remember(self, article_id):
+        self.seen[article_id] = True
+        if len(self.seen) > self.seen_size:
+            self.seen.popitem(last=False)
+
+    def _new_items(self, date_str):
+        new = []
+        for page_num in range(1, self.max_pages + 1):
+            res = self.scraper.get(f"{self.scraper.base_url}&date={date_str}&page={page_num}")
+            if res is None:
+                break
+            page = self.scraper.parser.parse_list_page(res.text)
+            fresh = [item for item in page.items if article_key(item.link) not in self.seen]
+            new.extend(fresh)
+            if len(fresh) < len(page.items) or page.is_last or not page.items:
+                break
+        return new
+
+    def poll(self):
+        self.polls += 1
+        detected_at = now_kst()
+        date_str = detected_at.strftime('%Y%m%d')
+        items = self._new_items(date_str)
+
+        matched = []
+        for title, link, time_str in items:
+            article_id = article_key(link)
+            self._remember(article_id)
+            if not self.primed:
+                continue
+            try:
+                published_at = parse_list_time(date_str, time_str, detected_at)
+            except ValueError as ve:
+                print(f"Error parsing date and time: {ve}")
+                continue
+            matches = self.scraper.matcher.find(title)
+            if matches:
+                matched.append((published_at, title, link, article_id, matches))
+
+        if not self.primed:
+            # 시작할 때 이미 목록에 있던 기사는 신호가 아니므로 본 것으로만 기록한다
+            self.primed = True
+            print(f"[Follow] Primed with {len(items)} existing articles for {date_str}")
+            return 0
+
+        if not matched:
+            return 0
+        contents = self.scraper.fetch_contents([link for _, _, link, _, _ in matched])
+        emitted = 0
+        for published_at, title, link, article_id, matches in matched:
+            for code, name in matches:
+                emitted_at = now_kst()
+                latency = (emitted_at - published_at).total_seconds()
+                self.emit({
+                    '시간': published_at,
+                    '종목명': name,
+                    '종목코드': code,
+                    '제목': title,
+                    '내용': contents[link],
+                    'article_id': article_id,
+                    'detected_at': detected_at,
+                    'emitted_at': emitted_at,
+                    'detect_latency': (detected_at - published_at).total_seconds(),
+                    'latency': latency,
+                })
+                self.latencies.append(latency)
+                emitted += 1
+        return emitted
+
+    def latency_summary(self):
+        if not self.latencies:
+            return "no events"
+        ordered = sorted(self.latencies)
+        p50 = ordered[len(ordered) // 2]
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return f"{len(ordered)} events, publish->emit p50 {p50:.1f}s, p95 {p95:.1f}s, max {ordered[-1]:.1f}s"
+
+    def run(self, duration=None):
+        started = time.time()
+        try:
+            while duration is None or time.time() - started < duration:
+                poll_started = time.time()
+                try:
+                    emitted = self.poll()
+                except Exception as e:
+                    print(f"[Follow] Poll failed: {e}")
+                    emitted = 0
+                if emitted:
+                    print(f"[Follow] Emitted {emitted} events. {self.latency_summary()}")
+                # 폴링 간격은 요청 시작 기준으로 맞춘다
+                time.sleep(max(0.0, self.interval - (time.time() - poll_started)))
+        except KeyboardInterrupt:
+            pass
+        print(f"[Follow] Stopped after {self.polls} polls: {self.latency_summary()}")
+
+
+def main():
+    matcher = load_matcher(mode_settings('stock'))
+
+    settings = {
+        'interval': 5.0,  # 1페이지를 다시 읽는 간격(초)
+        'max_pages': 3,
+        'events_path': 'data_news/live_events.jsonl',  # '-' 이면 표준 출력
+        'article_cache_path': 'data_news/article_cache.sqlite',
+    }
+    # 실시간 목록은 HTTP 캐시를 거치지 않는다 (매번 최신 1페이지가 필요하다)
+    limiter = AdaptiveRateLimiter(initial_rate=2.0, min_rate=0.2, max_rate=5.0)
+    fetcher = AsyncFetcher(headers=HEADERS, concurrency=4, process_id='follow', limiter=limiter)
+    scraper = NaverNewsScraper('follow', None, matcher=matcher,
+                               article_cache=ArticleCache(settings['article_cache_path']),
+                               fetcher=fetcher, parser=get_parser('lxml'), limiter=limiter)
+    emitter = JsonlEmitter(settings['events_path'])
+    try:
+        LiveFollower(scraper, emitter, interval=settings['interval'], max_pages=settings['max_pages']).run()
+    finally:
+        emitter.close()
+        fetcher.close()
+
+if __name__ == "__main__":
+    main()
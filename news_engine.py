@@ -0,0 +1,603 @@
+import argparse
+import csv
+import hashlib
+import importlib
+import multiprocessing
+import os
+import random
+import time
+from datetime import datetime
+from multiprocessing.util import Finalize
+
+import requests
+
+from article_cache import ArticleCache, article_key
+from crawl_ledger import CrawlLedger
+from day_scheduler import make_units, month_periods, run_serial, run_units
+from http_cache import HttpCache
+from news_parser import get_parser
+from news_sink import CsvSink, ParquetSink
+from rate_limiter import AdaptiveRateLimiter
+from scrape_metrics import Metrics, MetricsExporter
+from stock_matcher import StockMatcher
+from stock_universe import DEFAULT_PATH as UNIVERSE_PATH, DEFAULT_TTL_HOURS, load_universe
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/104.0.5112.79 Safari/537.36'
+}
+
+NEWS_HOST = 'https://news.naver.com'
+
+# 섹션은 'sid1/sid2' (세부 섹션) 또는 'sid1' (섹션 전체). 기본은 경제 > 증권
+DEFAULT_SECTION = '101/258'
+# 경제 세부 섹션: 금융, 증권, 산업/재계, 중기/벤처, 부동산, 글로벌 경제, 생활경제, 경제 일반
+ECONOMY_SECTIONS = ['101/259', '101/258', '101/261', '101/771', '101/260', '101/262', '101/310', '101/263']
+
+
+def section_url(section, host=NEWS_HOST):
+    sid1, _, sid2 = section.partition('/')
+    if sid2:
+        return f"{host}/main/list.naver?mode=LS2D&mid=sec&sid1={sid1}&sid2={sid2}&listType=title"
+    return f"{host}/main/list.naver?mode=LSD&mid=sec&sid1={sid1}&listType=title"
+
+
+def parse_sections(text):
+    # '101/258,101/259' 처럼 쉼표로 구분. 'economy' 는 경제 세부 섹션 전체
+    sections = []
+    for part in text.split(','):
+        part = part.strip()
+        sections.extend(ECONOMY_SECTIONS if part == 'economy' else [part] if part else [])
+    return list(dict.fromkeys(sections))
+
+
+BASE_URL = section_url(DEFAULT_SECTION)
+
+# 본문을 받지 못한 기사의 내용. 원장에는 받은 기사로 기록하지 않는다
+FAILED_CONTENT = "Failed to retrieve content"
+
+# 기사ID 는 oid/aid, 원본기사ID 는 근사 중복이면 먼저 수집한 기사의 ID (아니면 빈 값). 기존 열 뒤에 붙인다
+ALL_COLUMNS = ['시간', '제목', '내용', '기사ID', '원본기사ID']
+STOCK_COLUMNS = ['시간', '종목명', '종목코드', '제목', '내용', '기사ID', '원본기사ID']
+
+# 세 가지 작업 방식의 기본값. 단계(fetch, parser, matcher, sink, scheduler)는 CLI 옵션으로 바꿀 수 있다
+MODES = {
+    # 전체 기사: 종목 필터 없이 data_news_all 에 제목/본문만 남긴다 (news_scalping_all.py)
+    'all': {
+        'matcher': 'none', 'scheduler': 'pool', 'workers': 4, 'output_dir': 'data_news_all', 'prefix': 'news_all',
+        'article_cache': False, 'start': '2015-01-01', 'end': '2015-12-31',
+        'concurrency': 8, 'rate': (2.0, 0.2, 10.0), 'metrics_name': 'metrics',
+    },
+    # 종목 필터: 제목에 KOSPI 종목이 걸린 기사만 종목별 행으로 data_news 에 남긴다 (news_scalping.py)
+    'stock': {
+        'matcher': 'kospi', 'scheduler': 'pool', 'workers': 6, 'output_dir': 'data_news', 'prefix': 'news',
+        'article_cache': True, 'start': '2015-01-01', 'end': '2015-12-31',
+        'concurrency': 8, 'rate': (2.0, 0.2, 10.0), 'metrics_name': 'metrics',
+    },
+    # 단일 프로세스: Pool 없이 한 프로세스에서 날짜 순으로 돈다 (news_scalping_copy.py)
+    'single': {
+        'matcher': 'kospi', 'scheduler': 'single', 'workers': 1, 'output_dir': 'data_news', 'prefix': 'news',
+        'article_cache': True, 'start': '2023-08-01', 'end': '2023-08-27',
+        'concurrency': 4, 'rate': (1.0, 0.2, 5.0), 'metrics_name': 'metrics_copy',
+    },
+}
+
+
+def mode_settings(mode, **overrides):
+    settings = {
+        'fetch_mode': 'async',  # 'async' 또는 'sync'(requests.Session)
+        'output_format': 'csv',  # 'csv' 또는 'parquet'
+        'parser': 'lxml',  # 'bs4', 'lxml' 또는 'selectolax'
+        'http_cache_mode': 'revalidate',  # 'revalidate', 'cache-first' 또는 'offline'(캐시만으로 재추출)
+        'metrics_port': None,  # 숫자를 주면 http://127.0.0.1:port/metrics 로 Prometheus 텍스트를 내보낸다
+        'stocks_path': None,
+        'universe_path': UNIVERSE_PATH,  # 상장 종목 목록 캐시 (버전, 받은 시각과 함께 JSON 으로)
+        'universe_ttl': DEFAULT_TTL_HOURS,  # 시간. 지나면 다시 받고, 받지 못하면 오래된 캐시를 쓴다
+        'universe_offline': False,  # True 면 네트워크 없이 캐시만 쓴다
+        'store': False,  # True 면 끝난 뒤 조회용 월 파티션 Parquet 저장소로 합친다
+        'news_host': NEWS_HOST,  # 벤치마크의 로컬 스텁 서버처럼 다른 주소를 쓸 때
+        'sections': [DEFAULT_SECTION],
+        'dedup_titles': False,  # True 면 ±1일 안에 같은 정규화 제목이 있는 기사는 본문을 받지 않고 중복으로 기록한다
+    }
+    settings.update(MODES[mode])
+    settings.update((k, v) for k, v in overrides.items() if v is not None)
+    # 모드 기본값과 다른 종목 목록으로 돈 결과는 따로 둔다 (data_news_kosdaq, data_news_custom_<해시>).
+    # 원장과 중복 색인을 같이 쓰면 이미 끝난 날로 보고 아무것도 쓰지 않고, 같은 이름의 월 파일에 섞여 들어간다.
+    # 출력 형식도 원장/색인 이름에 넣는다. 본문 캐시(HTTP, 기사)는 URL 이 키라서 모두 함께 쓴다
+    cache_dir = settings['output_dir']
+    out = cache_dir if settings['matcher'] == MODES[mode]['matcher'] else f"{cache_dir}_{matcher_identity(settings)}"
+    state = '' if settings['output_format'] == 'csv' else f"_{settings['output_format']}"
+    settings.update(
+        mode=mode,
+        output_dir=out,
+        columns=ALL_COLUMNS if settings['matcher'] == 'none' else STOCK_COLUMNS,
+        article_cache_path=f'{cache_dir}/article_cache.sqlite' if settings['article_cache'] else None,
+        ledger_path=f'{out}/crawl_ledger{state}.sqlite',
+        dedup_path=f'{out}/dedup_index{state}.sqlite',
+        http_cache_path=f'{cache_dir}/http_cache',
+    )
+    return settings
+
+
+def matcher_identity(settings):
+    # 직접 고른 종목 목록은 파일 내용의 해시로 구분한다 (목록을 바꾸면 새로 돈다)
+    if settings['matcher'] != 'custom' or not settings['stocks_path']:
+        return settings['matcher']
+    with open(settings['stocks_path'], 'rb') as f:
+        return f"custom_{hashlib.sha1(f.read()).hexdigest()[:8]}"
+
+
+def load_stocks(settings, offline=False):
+    if settings['matcher'] == 'custom':
+        # 직접 고른 종목 목록: Code,Name (또는 종목코드,종목명) 헤더가 있는 CSV
+        with open(settings['stocks_path'], newline='', encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+        return [r.get('Code') or r['종목코드'] for r in rows], [r.get('Name') or r['종목명'] for r in rows]
+    return load_universe(settings['matcher'].upper(), settings['universe_path'], settings['universe_ttl'],
+                         offline=offline or settings['universe_offline'])
+
+
+def load_matcher(settings, offline=False):
+    if settings['matcher'] == 'none':
+        return None
+    stock_codes, stock_names = load_stocks(settings, offline)
+    return StockMatcher(stock_codes, stock_names, longest_match=False)
+
+
+def make_sink(settings, process_id):
+    if settings['output_format'] == 'parquet':
+        return ParquetSink(f"{settings['output_dir']}/parquet", process_id, settings['columns'])
+    return CsvSink(settings['output_dir'], settings['prefix'], process_id, settings['columns'])
+
+
+def parse_time(date, time_str):
+    # 목록의 시각은 '2015.01.02. 오후 3:04' 또는 '오후 3:04'. 뒤의 두 토큰만 쓴다
+    time_str = ' '.join(time_str.split()[-2:]).replace('오전', 'AM').replace('오후', 'PM')
+    return datetime.strptime(f"{date} {time_str}", '%Y%m%d %p %I:%M')
+
+
+class NaverNewsScraper:
+    # matcher 가 None 이면 모든 기사를 (시간, 제목, 내용) 으로, 있으면 제목에 걸린 종목마다 한 행씩 남긴다.
+    # 요청 간격은 공유 limiter 가 정한다 (main/run_day 와 live_follow 가 늘 넘긴다)
+    def __init__(self, process_id, sink, matcher=None, article_cache=None, fetcher=None, ledger=None,
+                 parser=None, http_cache=None, limiter=None, dedup=None, metrics=None, base_url=BASE_URL,
+                 section=DEFAULT_SECTION):
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.limiter = limiter
+        self.dedup = dedup
+        self.http_cache = http_cache
+        self.parser = parser if parser is not None else get_parser('bs4')
+        self.matcher = matcher
+        self.ledger = ledger
+        self.article_cache = article_cache
+        self.fetcher = fetcher
+        self.process_id = process_id
+        self.base_url = base_url
+        self.section = section
+        self.session = requests.Session()
+        self.headers = HEADERS
+        self.sink = sink
+        self.previous_titles = None
+        self.page_article_ids = []
+        self.fetched_ids = set()
+        self.session_start_time = time.time()
+        self.requests_saved = 0
+
+    def get(self, url):
+        # 재시도를 다 써도 실패하면 None. 호출한 쪽에서 그 페이지/기사를 건너뛴다
+        with self.metrics.timer('get'):
+            if self.http_cache is not None:
+                return self.http_cache.get(url, self._get)
+            return self._get(url)
+
+    def get_many(self, urls):
+        with self.metrics.timer('get_many'):
+            if self.http_cache is not None:
+                return self.http_cache.get_many(urls, self._get_many)
+            return self._get_many([(url, None) for url in urls])
+
+    def _get_many(self, batch):
+        # 비동기 엔진이 있으면 한 번에 동시 요청한다
+        if self.fetcher is not None:
+            return self.fetcher.get_many([url for url, _ in batch], [headers for _, headers in batch])
+        return [self._get(url, headers) for url, headers in batch]
+
+    def _get(self, url, extra_headers=None):
+        if self.fetcher is not None:
+            return self.fetcher.get(url, extra_headers)
+        headers = dict(self.headers, **extra_headers) if extra_headers else self.headers
+        wait = 1
+        retries = 0
+        max_retries = 5
+        while retries < max_retries:
+            try:
+                if self.limiter is not None:
+                    with self.metrics.timer('throttle'):
+                        self.limiter.acquire()
+                started = time.time()
+                self.metrics.count('requests')
+                res = self.session.get(url, headers=headers)
+                if self.limiter is not None:
+                    self.limiter.report(time.time() - started, res.status_code)
+                res.raise_for_status()
+                return res
+            except (requests.exceptions.RequestException, OSError) as e:
+                self.metrics.count('retries')
+                if self.limiter is not None:
+                    # 공유 limiter 가 모든 워커를 함께 늦추므로 여기서 따로 잠들지 않는다
+                    if not isinstance(e, requests.exceptions.HTTPError):
+                        self.limiter.report(error=True)
+                    print(f"[Process {self.process_id}] Connection error: {e}. Retrying after shared backoff...")
+                else:
+                    print(f"[Process {self.process_id}] Connection error: {e}. Retrying in {wait} seconds...")
+                    time.sleep(wait)
+                    wait *= 2
+                retries += 1
+        self.metrics.count('failures')
+        print(f"[Process {self.process_id}] Failed to fetch data from {url} after {max_retries} attempts.")
+        return None
+
+    def parse_article_html(self, html):
+        with self.metrics.timer('parse_article'):
+            return self.parser.parse_article(html)
+
+    def fetch_contents(self, links):
+        self.metrics.count('articles', len(set(links)))
+        contents = {}
+        missing = []
+        for link in dict.fromkeys(links):
+            cached = self.article_cache.get(link) if self.article_cache is not None else None
+            if cached is not None:
+                contents[link] = cached
+            else:
+                missing.append(link)
+
+        # 비동기 엔진이 있으면 한 페이지의 기사 본문을 동시에 받는다
+        responses = self.get_many(missing)
+
+        for link, res in zip(missing, responses):
+            if res is None:
+                contents[link] = FAILED_CONTENT
+                continue
+            contents[link] = self.parse_article_html(res.text)
+            if self.article_cache is not None:
+                self.article_cache.put(link, contents[link])
+        return contents
+
+    def parse_news(self, items, date):
+        if not items:
+            print(f"[Process {self.process_id}] No articles found on this page.")
+            return False
+
+        current_titles = [item.title for item in items]
+
+        if self.previous_titles == current_titles:
+            print(f"[Process {self.process_id}] All titles on this page are the same as the previous page. Moving to the next date.")
+            return False
+
+        self.previous_titles = current_titles
+
+        # matches 가 None 이면 종목 필터 없이 기사 한 건이 한 행이다
+        # parse_news 는 목록 항목의 시각 해석과 종목 매칭만 잰다. 본문 fetch 는 get_many, 본문 파싱은 parse_article
+        parsed = []
+        with self.metrics.timer('parse_news'):
+            for title, link, time_str in items:
+                try:
+                    news_datetime = parse_time(date, time_str)
+                except ValueError as ve:
+                    print(f"Error parsing date and time: {ve}")
+                    continue
+
+                matches = None
+                if self.matcher is not None:
+                    with self.metrics.timer('match'):
+                        matches = self.matcher.find(title)
+                    if not matches:
+                        continue
+                parsed.append((news_datetime, title, link, matches))
+
+        if self.fetched_ids:
+            # 이어받는 날에는 이전 실행에서 이미 받은 기사를 건너뛴다 (그 사이 목록이 밀려 다음 페이지로 넘어온 기사)
+            parsed = [p for p in parsed if article_key(p[2]) not in self.fetched_ids]
+
+        if self.dedup is not None:
+            # 이미 수집한 기사는 본문을 받지 않는다 (--dedup-titles 면 같은 제목으로 다시 낸 기사도)
+            keep = self.dedup.screen([(article_key(link), title) for _, title, link, _ in parsed], date)
+            parsed = [p for p in parsed if article_key(p[2]) in keep]
+
+        try:
+            # 여러 종목이 걸린 기사도 본문은 한 번만 가져온다
+            contents = self.fetch_contents([link for _, _, link, _ in parsed])
+        except Exception as e:
+            # 이 페이지는 완료로 기록하지 않는다. 다시 실행하면 이 페이지부터 이어간다
+            print(f"[Process {self.process_id}] Error fetching article contents: {e!r}")
+            return None
+        self.page_article_ids = list(dict.fromkeys(article_key(link) for _, _, link, _ in parsed
+                                                   if contents[link] != FAILED_CONTENT))
+
+        for news_datetime, title, link, matches in parsed:
+            # 본문이 거의 같은 기사도 출력에 남기고 원본기사ID 열에 원본 ID 를 적는다 (duplicates.csv 에도 나간다).
+            # 본문을 받지 못한 기사는 색인에 넣지 않는다. 넣으면 이후 screen() 이 '이미 수집한 기사'로 보고 다시 받지 않는다
+            article_id = article_key(link)
+            dup_of = None
+            if self.dedup is not None and contents[link] != FAILED_CONTENT:
+                dup_of = self.dedup.add(article_id, title, date, contents[link])
+            if matches is None:
+                self.sink.append({
+                    '시간': news_datetime,
+                    '제목': title,
+                    '내용': contents[link],
+                    '기사ID': article_id,
+                    '원본기사ID': dup_of
+                }, article_id=article_id)
+                continue
+            for code, name in matches:
+                self.sink.append({
+                    '시간': news_datetime,
+                    '종목명': name,
+                    '종목코드': code,
+                    '제목': title,
+                    '내용': contents[link],
+                    '기사ID': article_id,
+                    '원본기사ID': dup_of
+                }, article_id=article_id)
+        # 남길 기사가 없어도 새 페이지였다면 True. False 는 '더 이상 페이지가 없음', None 은 '이 페이지 실패'
+        return True
+
+    def ledger_key(self, date_str):
+        # 기본 섹션은 날짜만 키로 써서 섹션을 나누기 전에 만든 원장도 그대로 이어간다
+        return date_str if self.section == DEFAULT_SECTION else f'{date_str}@{self.section}'
+
+    def scrape_day(self, current_date):
+        date_str = current_date.strftime('%Y%m%d')
+        ledger_key = self.ledger_key(date_str)
+        page_num = 1
+        pages = 0
+        day_finished = False
+        self.previous_titles = None
+        self.fetched_ids = set()
+
+        if self.ledger is not None:
+            # 이전 실행에서 끝낸 페이지는 건너뛰고 그 다음 페이지부터 이어간다
+            day_finished, last_page, self.previous_titles = self.ledger.day_state(ledger_key)
+            page_num = last_page + 1
+            if day_finished:
+                print(f"\n[Process {self.process_id}] {date_str} ({self.section}) already completed. Skipping.")
+            elif last_page:
+                self.fetched_ids = self.ledger.fetched_ids(ledger_key)
+                print(f"\n[Process {self.process_id}] Resuming {date_str} ({self.section}) from page {page_num} "
+                      f"({len(self.fetched_ids)} articles already fetched)")
+
+        if not day_finished:
+            print(f"\n[Process {self.process_id}] Scraping date: {date_str} ({self.section})")
+
+        while not day_finished:
+            url = f"{self.base_url}&date={date_str}&page={page_num}"
+            res = self.get(url)
+            if res is None:
+                print(f"[Process {self.process_id}] Skipping page {page_num} on date {date_str} due to repeated failures.")
+                break
+            with self.metrics.timer('parse_list'):
+                page = self.parser.parse_list_page(res.text)
+            self.metrics.count('pages')
+            pages += 1
+
+            # Naver 는 범위를 벗어난 페이지 번호에 마지막 페이지를 다시 돌려준다
+            if page.current_page is not None and page.current_page != page_num:
+                print(f"[Process {self.process_id}] Page {page_num} is past the last page ({page.current_page}). Moving to the next date.")
+                if self.ledger is not None:
+                    self.ledger.finish_day(ledger_key)
+                break
+
+            more = self.parse_news(page.items, date_str)
+            if more is None:
+                print(f"[Process {self.process_id}] Page {page_num} on date {date_str} failed. Leaving the day unfinished.")
+                if self.dedup is not None:
+                    self.dedup.rollback()
+                break
+            if not more:
+                print(f"[Process {self.process_id}] No more new articles or repeated articles detected. Moving to the next date.")
+                if self.ledger is not None:
+                    self.ledger.finish_day(ledger_key)
+                break
+
+            # 페이지의 행이 디스크에 남은 뒤에만 완료로 기록한다
+            with self.metrics.timer('flush'):
+                self.sink.flush()
+            if self.dedup is not None:
+                self.dedup.commit()
+            if self.ledger is not None:
+                self.ledger.record_page(ledger_key, page_num, self.previous_titles, self.page_article_ids)
+
+            # 페이저로 마지막 페이지임을 알면 확인용 요청 없이 바로 다음 날짜로 넘어간다
+            if page.is_last:
+                print(f"[Process {self.process_id}] {date_str}, {page_num} page is the last page. Moving to the next date.")
+                self.requests_saved += 1
+                if self.ledger is not None:
+                    self.ledger.finish_day(ledger_key)
+                break
+
+            print(f"[Process {self.process_id}] {date_str}, {page_num} page.")
+            page_num += 1
+
+            if time.time() - self.session_start_time > 1800:
+                print(f"[Process {self.process_id}] Restarting session due to long session duration.")
+                self.session.close()
+                self.session = requests.Session()
+                self.session_start_time = time.time()
+
+        self.previous_titles = None
+        self.fetched_ids = set()
+        return pages
+
+_matcher = None
+_article_cache = None
+_ledger = None
+_dedup = None
+_fetcher = None
+_http_cache = None
+_limiter = None
+_metrics = None
+_exporter = None
+_settings = None
+
+def init_worker(settings, limiter):
+    # 오토마톤과 캐시, 원장, fetch 엔진은 워커마다 한 번만 만들어 모든 작업 단위에서 공유한다
+    global _matcher, _article_cache, _ledger, _dedup, _fetcher, _http_cache, _limiter, _metrics, _settings
+    # 부모가 이미 상장 목록 캐시를 갱신했으므로 워커는 로컬 파일에서 오토마톤을 직접 만든다 (작업마다 목록을 받지 않는다)
+    _matcher = load_matcher(settings, offline=True)
+    _limiter = limiter
+    # 워커별 단계 시간/카운터. run_day 마다 비워서 결과와 함께 부모로 보낸다
+    _metrics = Metrics()
+    _settings = settings
+    _http_cache = HttpCache(settings['http_cache_path'], settings['http_cache_mode'])
+    _article_cache = ArticleCache(settings['article_cache_path']) if settings.get('article_cache_path') else None
+    # 오프라인 재추출은 네트워크를 쓰지 않으므로 원장으로 건너뛸 필요 없이 전부 다시 돈다
+    _ledger = CrawlLedger(settings['ledger_path']) if settings['http_cache_mode'] != 'offline' else None
+    if settings['http_cache_mode'] != 'offline':
+        # numpy(dedup_index) 와 aiohttp(async_fetch) 는 쓰는 설정일 때만 import 한다.
+        # Pool 을 쓰면 preload_modules() 가 부모에서 먼저 import 해 두므로 fork 로 뜬 워커에서는 이미 로드되어 있다
+        from dedup_index import DedupIndex
+        _dedup = DedupIndex(settings['dedup_path'], skip_titles=settings['dedup_titles'])
+    if settings['fetch_mode'] == 'async':
+        from async_fetch import AsyncFetcher
+        _fetcher = AsyncFetcher(headers=HEADERS, concurrency=settings.get('concurrency', 8), per_host_rate=2.0,
+                                process_id=multiprocessing.current_process().name, limiter=limiter,
+                                metrics=_metrics)
+        Finalize(_fetcher, _fetcher.close, exitpriority=10)
+
+    delay = random.uniform(*settings.get('start_delay', (1, 5)))
+    print(f"{multiprocessing.current_process().name} starting after {delay:.2f} seconds delay.")
+    time.sleep(delay)
+
+def preload_modules(settings):
+    # Pool 을 만들기 직전에 부모에서 한 번 import 해 두면 fork 로 뜨는 워커들이 따로 import 하지 않고 물려받는다.
+    # spawn(macOS/Windows 기본)으로 뜨는 워커는 부모의 모듈을 물려받지 않으므로 init_worker 에서 각자 import 하고,
+    # 이때는 부모의 import 가 도움이 되지 않는다
+    if settings['http_cache_mode'] != 'offline':
+        importlib.import_module('dedup_index')
+    if settings['fetch_mode'] == 'async':
+        importlib.import_module('async_fetch')
+
+def run_day(unit):
+    started = time.time()
+    cache_before = _article_cache.stats() if _article_cache is not None else {}
+    dedup_before = _dedup.stats() if _dedup is not None else {}
+    http_before = _http_cache.stats()
+    sink = make_sink(_settings, unit.month)
+    section = unit.section or DEFAULT_SECTION
+    scraper = NaverNewsScraper(unit.month, sink, matcher=_matcher, article_cache=_article_cache,
+                               fetcher=_fetcher, ledger=_ledger, parser=get_parser(_settings['parser']),
+                               http_cache=_http_cache, limiter=_limiter, dedup=_dedup, metrics=_metrics,
+                               base_url=section_url(section, _settings.get('news_host', NEWS_HOST)), section=section)
+    pages = scraper.scrape_day(unit.date)
+    saved = scraper.requests_saved
+    result = {}
+    if _article_cache is not None:
+        result.update({k: v - cache_before[k] for k, v in _article_cache.stats().items()})
+    if _dedup is not None:
+        result.update({k: v - dedup_before[k] for k, v in _dedup.stats().items()})
+    result.update({k: v - http_before[k] for k, v in _http_cache.stats().items()})
+    result.update(date=unit.date.strftime('%Y-%m-%d'), month=unit.month, section=section, pages=pages, requests_saved=saved,
+                  elapsed=time.time() - started, metrics=_metrics.drain())
+    return result
+
+def compact_month(month, start, end):
+    # 병합 단계: 그 달의 모든 날이 끝나면 run 파일들을 월 파일 하나로 합친다
+    with _exporter.timer('compact'):
+        make_sink(_settings, month).compact(start, end)
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description='Naver finance news scraper')
+    parser.add_argument('mode', choices=sorted(MODES), help="'all' 전체 기사, 'stock' 종목 필터, 'single' 단일 프로세스 종목 필터")
+    parser.add_argument('--start', help='YYYY-MM-DD')
+    parser.add_argument('--end', help='YYYY-MM-DD')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--scheduler', choices=['pool', 'single'])
+    parser.add_argument('--fetch', dest='fetch_mode', choices=['async', 'sync'])
+    parser.add_argument('--parser', choices=['bs4', 'lxml', 'selectolax'])
+    parser.add_argument('--format', dest='output_format', choices=['csv', 'parquet'])
+    parser.add_argument('--matcher', choices=['none', 'kospi', 'kosdaq', 'krx', 'custom'])
+    parser.add_argument('--stocks', dest='stocks_path', help="--matcher custom 에 쓸 Code,Name CSV")
+    parser.add_argument('--universe-ttl', type=float, help='상장 종목 목록 캐시를 다시 받을 간격(시간, 기본 24)')
+    parser.add_argument('--offline-universe', dest='universe_offline', action='store_true', default=None,
+                        help='상장 종목 목록을 받지 않고 캐시만 쓴다')
+    parser.add_argument('--http-cache-mode', choices=['revalidate', 'cache-first', 'offline'])
+    parser.add_argument('--metrics-port', type=int)
+    parser.add_argument('--store', action='store_true', default=None,
+                        help='끝나면 월 파일들을 <output_dir>/store 의 월 파티션 Parquet 로 합친다 (news_store.py)')
+    parser.add_argument('--sections', type=parse_sections,
+                        help="쉼표로 구분한 'sid1/sid2' 또는 'sid1' 목록. 'economy' 는 경제 세부 섹션 전체 (기본 101/258)")
+    parser.add_argument('--host', dest='news_host', help='목록 주소의 호스트 (기본 https://news.naver.com)')
+    parser.add_argument('--dedup-titles', action='store_true', default=None,
+                        help='가까운 날짜에 같은 제목이 이미 있는 기사는 본문을 받지 않는다 (매일 같은 제목의 기사도 빠진다)')
+    return parser
+
+def main(argv=None):
+    global _settings, _exporter
+    arg_parser = build_arg_parser()
+    args = vars(arg_parser.parse_args(argv))
+    settings = mode_settings(args.pop('mode'), **args)
+    if settings['matcher'] == 'custom' and not settings['stocks_path']:
+        arg_parser.error('--matcher custom requires --stocks')
+    if settings['matcher'] != 'none':
+        # 상장 목록은 부모에서 한 번만 확인/갱신한다. 오토마톤은 워커가 캐시에서 직접 만든다
+        load_stocks(settings)
+
+    start_date_dt = datetime.strptime(settings['start'], '%Y-%m-%d')
+    end_date_dt = datetime.strptime(settings['end'], '%Y-%m-%d')
+    periods = month_periods(start_date_dt, end_date_dt)
+    # 모든 섹션의 날짜가 하나의 작업 큐와 하나의 limiter 를 함께 쓴다
+    units = make_units(periods, settings['sections'])
+
+    _settings = settings
+    os.makedirs(settings['output_dir'], exist_ok=True)
+    os.makedirs(os.path.dirname(settings['http_cache_path']), exist_ok=True)
+    # 워커 스냅샷을 합쳐 30초마다 JSON 과 Prometheus 텍스트 파일로 쓴다
+    metrics_path = f"{settings['output_dir']}/{settings['metrics_name']}"
+    _exporter = MetricsExporter(json_path=metrics_path + '.json', prom_path=metrics_path + '.prom', interval=30,
+                                port=settings['metrics_port'])
+    # 모든 워커가 하나의 AIMD limiter 를 공유해 Naver 에 보내는 전체 요청 속도를 함께 조절한다
+    initial_rate, min_rate, max_rate = settings['rate']
+    limiter = AdaptiveRateLimiter(initial_rate=initial_rate, min_rate=min_rate, max_rate=max_rate)
+    if settings['scheduler'] == 'single':
+        init_worker(dict(settings, start_delay=(0, 0)), limiter)
+        results = run_serial(run_day, units, periods, on_month_done=compact_month, exporter=_exporter)
+    else:
+        preload_modules(settings)
+        with multiprocessing.Pool(processes=settings['workers'], initializer=init_worker,
+                                  initargs=(settings, limiter)) as pool:
+            results = run_units(pool, run_day, units, periods, on_month_done=compact_month, exporter=_exporter)
+            pool.close()
+            pool.join()
+
+    _exporter.close()
+    print(f"Rate limiter: {limiter.stats()}")
+    print(f"Metrics: {_exporter.summary()}")
+    if len(settings['sections']) > 1:
+        pages = {section: sum(r['pages'] for r in results if r['section'] == section) for section in settings['sections']}
+        print("Sections: " + ', '.join(f"{section} {n} pages" for section, n in pages.items()))
+    http = {k: sum(r.get(k, 0) for r in results) for k in ('http_hits', 'http_revalidated', 'http_misses')}
+    print(f"HTTP cache ({settings['http_cache_mode']}): {http['http_hits']} hits, "
+          f"{http['http_revalidated']} revalidated (304), {http['http_misses']} misses")
+    if settings['article_cache_path']:
+        totals = {k: sum(r.get(k, 0) for r in results) for k in ('memory_hits', 'disk_hits', 'misses')}
+        lookups = sum(totals.values())
+        hit_rate = (totals['memory_hits'] + totals['disk_hits']) / lookups if lookups else 0.0
+        print(f"Article cache: {totals['memory_hits']} memory hits, {totals['disk_hits']} disk hits, "
+              f"{totals['misses']} misses ({hit_rate:.1%} hit rate)")
+    if settings['http_cache_mode'] != 'offline':
+        # 근사 중복(과 --dedup-titles 로 건너뛴 기사)의 원본 기사 ID 목록. 출력 행과는 날짜/제목으로 맞춘다
+        from dedup_index import DedupIndex
+        index = DedupIndex(settings['dedup_path'])
+        duplicates_path = index.export_duplicates(f"{settings['output_dir']}/duplicates.csv")
+        index.close()
+        dedup = {k: sum(r.get(k, 0) for r in results) for k in ('skipped_known', 'skipped_titles', 'near_duplicates')}
+        print(f"Dedup: {dedup['skipped_known']} known articles and {dedup['skipped_titles']} same-title reposts skipped "
+              f"before fetch, {dedup['near_duplicates']} near-duplicate bodies kept and listed in {duplicates_path}")
+    if settings['store']:
+        from news_store import compact_store
+        compact_store(settings['output_dir'])
+    return results
+
+if __name__ == "__main__":
+    main()
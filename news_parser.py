@@ -0,0 +1,189 @@
+from collections import namedtuple
+
+# 목록 페이지의 기사 한 건: 제목, 링크, 날짜 span 의 원문 텍스트
+ListItem = namedtuple('ListItem', ['title', 'link', 'time_str'])
+
+class ListPage(namedtuple('ListPage', ['items', 'current_page', 'last_page', 'has_next'])):
+    # current_page 는 페이저에서 강조된 번호, last_page 는 페이저에 보이는 가장 큰 번호,
+    # has_next 는 '다음' 링크(다음 10페이지 묶음) 유무. 페이저가 없으면 셋 다 None 이다
+    __slots__ = ()
+
+    @property
+    def is_last(self):
+        return self.current_page is not None and not self.has_next and self.current_page >= self.last_page
+
+
+def _pager(current, numbers, has_next):
+    if current is None:
+        return None, None, None
+    return current, max([current] + numbers), has_next
+
+
+def _page_numbers(texts):
+    return [int(t.strip()) for t in texts if t.strip().isdigit()]
+
+
+ARTICLE_DROP_TAGS = ('script', 'style', 'div', 'span')
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+
+def _collapse_whitespace(text):
+    # BeautifulSoup 은 공백만 있는 문자열 노드를 '\n' 또는 ' ' 하나로 줄인다. 다른 백엔드도 같은 결과를 내도록 맞춘다.
+    if text and not text.strip(ASCII_SPACES):
+        return '\n' if '\n' in text else ' '
+    return text
+
+
+class BsParser:
+    name = 'bs4'
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self._bs = BeautifulSoup
+
+    def parse_list_page(self, html):
+        soup = self._bs(html, 'html.parser')
+        items = []
+        for article in soup.select('ul.type02 li'):
+            title_tag = article.find('a')
+            if not title_tag:
+                continue
+            date_tag = article.find('span', {'class': 'date'})
+            items.append(ListItem(
+                title_tag.get_text().strip(),
+                title_tag.get('href'),
+                date_tag.get_text().strip() if date_tag else "",
+            ))
+
+        current, numbers, has_next = None, [], None
+        paging = soup.select_one('div.paging')
+        if paging is not None and paging.find('strong') is not None:
+            current = _page_numbers([paging.find('strong').get_text()])
+            current = current[0] if current else None
+            numbers = _page_numbers([a.get_text() for a in paging.find_all('a')])
+            has_next = paging.select_one('a.next') is not None
+        return ListPage(items, *_pager(current, numbers, has_next))
+
+    def parse_article(self, html):
+        soup = self._bs(html, 'html.parser')
+        content = soup.select_one('article#dic_area')
+        if content:
+            for tag in content(list(ARTICLE_DROP_TAGS)):
+                tag.extract()
+            return content.get_text().strip()
+        return "No content available"
+
+
+class LxmlParser:
+    name = 'lxml'
+
+    _LIST_XPATH = "//ul[contains(concat(' ', normalize-space(@class), ' '), ' type02 ')]//li"
+    _DATE_XPATH = "(.//span[contains(concat(' ', normalize-space(@class), ' '), ' date ')])[1]"
+
+    def __init__(self):
+        import lxml.html
+        self._html = lxml.html
+
+    def _parse(self, html):
+        if not html or not html.strip():
+            return None
+        return self._html.fromstring(html)
+
+    _PAGING_XPATH = "(//div[contains(concat(' ', normalize-space(@class), ' '), ' paging ')])[1]"
+
+    def parse_list_page(self, html):
+        doc = self._parse(html)
+        if doc is None:
+            return ListPage([], None, None, None)
+        items = []
+        for article in doc.xpath(self._LIST_XPATH):
+            title_tag = article.xpath('(.//a)[1]')
+            if not title_tag:
+                continue
+            date_tag = article.xpath(self._DATE_XPATH)
+            items.append(ListItem(
+                title_tag[0].text_content().strip(),
+                title_tag[0].get('href'),
+                date_tag[0].text_content().strip() if date_tag else "",
+            ))
+
+        current, numbers, has_next = None, [], None
+        paging = doc.xpath(self._PAGING_XPATH)
+        if paging and paging[0].xpath('.//strong'):
+            paging = paging[0]
+            current = _page_numbers([paging.xpath('.//strong')[0].text_content()])
+            current = current[0] if current else None
+            numbers = _page_numbers([a.text_content() for a in paging.xpath('.//a')])
+            has_next = bool(paging.xpath(".//a[contains(concat(' ', normalize-space(@class), ' '), ' next ')]"))
+        return ListPage(items, *_pager(current, numbers, has_next))
+
+    def parse_article(self, html):
+        doc = self._parse(html)
+        content = doc.xpath("//article[@id='dic_area']") if doc is not None else []
+        if content:
+            content = content[0]
+            for el in content.iter():
+                el.text = _collapse_whitespace(el.text)
+                if el is not content:
+                    el.tail = _collapse_whitespace(el.tail)
+            # drop_tree 는 태그 뒤의 tail 텍스트를 남기므로 BeautifulSoup 의 extract 와 결과가 같다
+            for tag in content.xpath('.//*[' + ' or '.join(f'self::{t}' for t in ARTICLE_DROP_TAGS) + ']'):
+                tag.drop_tree()
+            return content.text_content().strip()
+        return "No content available"
+
+
+class SelectolaxParser:
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def parse_list_page(self, html):
+        tree = self._parser(html)
+        items = []
+        for article in tree.css('ul.type02 li'):
+            title_tag = article.css_first('a')
+            if title_tag is None:
+                continue
+            date_tag = article.css_first('span.date')
+            items.append(ListItem(
+                title_tag.text(deep=True).strip(),
+                title_tag.attributes.get('href'),
+                date_tag.text(deep=True).strip() if date_tag is not None else "",
+            ))
+
+        current, numbers, has_next = None, [], None
+        paging = tree.css_first('div.paging')
+        if paging is not None and paging.css_first('strong') is not None:
+            current = _page_numbers([paging.css_first('strong').text(deep=True)])
+            current = current[0] if current else None
+            numbers = _page_numbers([a.text(deep=True) for a in paging.css('a')])
+            has_next = paging.css_first('a.next') is not None
+        return ListPage(items, *_pager(current, numbers, has_next))
+
+    def parse_article(self, html):
+        tree = self._parser(html)
+        content = tree.css_first('article#dic_area')
+        if content is not None:
+            for tag in content.css(', '.join(ARTICLE_DROP_TAGS)):
+                tag.decompose()
+            texts = [_collapse_whitespace(node.text_content) for node in content.traverse(include_text=True)
+                     if node.tag == '-text']
+            return ''.join(texts).strip()
+        return "No content available"
+
+
+PARSERS = {
+    'bs4': BsParser,
+    'lxml': LxmlParser,
+    'selectolax': SelectolaxParser,
+}
+
+
+def get_parser(name='bs4'):
+    try:
+        return PARSERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown parser backend: {name} (choose from {', '.join(PARSERS)})")
@@ -0,0 +1,188 @@
+import csv
+import glob
+import heapq
+import os
+import uuid
+from datetime import timedelta
+
+from record_buffer import RecordBuffer, from_epoch_us
+
+
+MAX_MERGE_FAN_IN = 64
+
+
+def _log(process_id, message):
+    prefix = f"[Process {process_id}] " if process_id is not None else ""
+    print(f"{prefix}{message}")
+
+
+def _conform(table, columns):
+    # 열이 늘기 전에 저장된 Parquet 파일은 없는 열을 null 로 채워 새 part 들과 스키마를 맞춘다
+    import pyarrow as pa
+
+    for column in columns:
+        if column not in table.column_names:
+            table = table.append_column(column, pa.nulls(table.num_rows, pa.string()))
+    return table.select(columns)
+
+
+class CsvSink:
+    # 파싱한 행을 batch_size 단위로 정렬된 run 파일에 바로 흘려 보내고,
+    # 월말 compact() 에서 run 들을 병합 정렬해 기존과 같은 UTF-8-SIG CSV 한 개로 만든다.
+    def __init__(self, directory, prefix, process_id, columns, batch_size=500):
+        self.directory = directory
+        self.prefix = prefix
+        self.process_id = process_id
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.run_dir = os.path.join(directory, f'.runs_{prefix}_proc_{process_id}' if process_id is not None else f'.runs_{prefix}')
+        self.buffer = RecordBuffer(self.columns)
+
+    def append(self, row, article_id=None):
+        self.buffer.append(row, article_id)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        os.makedirs(self.run_dir, exist_ok=True)
+        path = os.path.join(self.run_dir, f'run_{uuid.uuid4().hex}.csv')
+        with open(path + '.tmp', 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(self.buffer.rows(self.buffer.order(reverse=True)))
+        os.replace(path + '.tmp', path)
+        self.buffer.clear()
+
+    def _read_run(self, path, encoding='utf-8'):
+        with open(path, newline='', encoding=encoding) as f:
+            yield from csv.reader(f)
+
+    def _read_saved(self, path):
+        # 이미 저장된 월 파일. 열이 늘기 전(기사ID/원본기사ID 이전)에 저장된 파일도 헤더 이름으로 맞추고 없는 열은 비운다
+        rows = self._read_run(path, encoding='utf-8-sig')
+        header = next(rows, None)
+        if header is None:
+            return
+        if header == self.columns:
+            yield from rows
+            return
+        index = [header.index(c) if c in header else None for c in self.columns]
+        for row in rows:
+            yield [row[i] if i is not None else '' for i in index]
+
+    def _merge_runs(self, runs):
+        # 열린 파일 수를 제한하기 위해 run 이 많으면 먼저 몇 개씩 묶어 중간 run 으로 합친다
+        time_idx = self.columns.index('시간')
+        path = os.path.join(self.run_dir, f'run_{uuid.uuid4().hex}.csv')
+        merged = heapq.merge(*(self._read_run(p) for p in runs), key=lambda r: r[time_idx], reverse=True)
+        with open(path + '.tmp', 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(merged)
+        os.replace(path + '.tmp', path)
+        for p in runs:
+            os.remove(p)
+        return path
+
+    def compact(self, start_date, end_date, filepath=None):
+        self.flush()
+        runs = sorted(glob.glob(os.path.join(self.run_dir, 'run_*.csv')))
+        if not runs:
+            return None
+        while len(runs) > MAX_MERGE_FAN_IN:
+            runs = [self._merge_runs(runs[:MAX_MERGE_FAN_IN])] + runs[MAX_MERGE_FAN_IN:]
+        if filepath is None:
+            filepath = os.path.join(
+                self.directory,
+                f'{self.prefix}_{start_date.strftime("%Y-%m-%d")}_to_{end_date.strftime("%Y-%m-%d")}_proc_{self.process_id}.csv',
+            )
+
+        # 시간 문자열은 ISO 형식이라 문자열 비교만으로 정렬된다.
+        # 같은 시각의 행만 기억해 두고, 재시작으로 두 번 기록된 행은 한 번만 쓴다.
+        # 재시작으로 이미 저장된 월 파일이 있으면 그것도 하나의 run 으로 합친다.
+        time_idx = self.columns.index('시간')
+        sources = [self._read_run(p) for p in runs]
+        if os.path.exists(filepath):
+            sources.append(self._read_saved(filepath))
+        merged = heapq.merge(*sources, key=lambda r: r[time_idx], reverse=True)
+        count = 0
+        with open(filepath + '.tmp', 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.columns)
+            current_time, seen = None, set()
+            for row in merged:
+                if row[time_idx] != current_time:
+                    current_time, seen = row[time_idx], set()
+                key = tuple(row)
+                if key in seen:
+                    continue
+                seen.add(key)
+                writer.writerow(row)
+                count += 1
+        os.replace(filepath + '.tmp', filepath)
+        for path in runs:
+            os.remove(path)
+        _log(self.process_id, f"Saved {count} news items to {filepath}")
+        return filepath
+
+
+class ParquetSink:
+    # date=YYYY-MM-DD/process=N 로 파티션된 Parquet part 파일에 배치 단위로 쓴다.
+    # compact() 는 파티션마다 part 들을 시간 역순으로 정렬된 파일 하나로 합친다.
+    def __init__(self, directory, process_id, columns, batch_size=500):
+        self.directory = directory
+        self.process_id = process_id
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.buffer = RecordBuffer(self.columns)
+
+    def _partition_dir(self, day):
+        return os.path.join(self.directory, f'date={day}', f'process={self.process_id}')
+
+    def append(self, row, article_id=None):
+        self.buffer.append(row, article_id)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        import pyarrow.parquet as pq
+
+        by_day = {}
+        for i, t in enumerate(self.buffer.times):
+            by_day.setdefault(from_epoch_us(t).strftime('%Y-%m-%d'), []).append(i)
+        for day, indices in by_day.items():
+            part_dir = self._partition_dir(day)
+            os.makedirs(part_dir, exist_ok=True)
+            table = self.buffer.to_arrow(indices, dictionary=False)
+            path = os.path.join(part_dir, f'part-{uuid.uuid4().hex}.parquet')
+            pq.write_table(table, path + '.tmp')
+            os.replace(path + '.tmp', path)
+        self.buffer.clear()
+
+    def compact(self, start_date, end_date, filepath=None):
+        self.flush()
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        count = 0
+        day = start_date
+        while day <= end_date:
+            part_dir = self._partition_dir(day.strftime('%Y-%m-%d'))
+            parts = sorted(glob.glob(os.path.join(part_dir, 'part-*.parquet')))
+            day += timedelta(days=1)
+            if not parts:
+                continue
+            path = os.path.join(part_dir, 'data.parquet')
+            if os.path.exists(path):
+                parts.append(path)
+            table = pa.concat_tables([_conform(pq.read_table(p), self.columns) for p in parts]).combine_chunks()
+            table = table.group_by(self.columns).aggregate([]).select(self.columns)
+            table = table.sort_by([('시간', 'descending')])
+            pq.write_table(table, path + '.tmp')
+            os.replace(path + '.tmp', path)
+            for p in parts:
+                if p != path:
+                    os.remove(p)
+            count += table.num_rows
+        _log(self.process_id, f"Compacted {count} news items under {self.directory}")
+        return self.directory
@@ -0,0 +1,271 @@
+import argparse
+import glob
+import json
+import os
+import re
+import time
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# 월 파일(news_2015-01-01_to_2015-01-31_proc_0.csv)과 ParquetSink 파티션(date=2015-01-02/process=0)에서 월을 읽는다
+_CSV_MONTH = re.compile(r'_(\d{4}-\d{2})-\d{2}_to_\d{4}-\d{2}-\d{2}_proc_[^_]+\.csv$')
+_PARQUET_MONTH = re.compile(r'date=(\d{4}-\d{2})-\d{2}')
+ROW_GROUP_SIZE = 1024
+# 저장소의 열 순서. 원본 파일에 있는 열만 쓴다 (기사ID/원본기사ID 는 그 열이 생긴 뒤의 출력에만 있다)
+COLUMNS = ['시간', '종목명', '종목코드', '제목', '내용', '기사ID', '원본기사ID']
+MANIFEST = '_manifest.json'
+
+
+def find_sources(directory):
+    # {월: [파일, ...]}. data_news, data_news_all, data_news_tagged 의 출력 형식을 모두 받는다
+    months = {}
+    for path in sorted(glob.glob(os.path.join(directory, 'news*_proc_*.csv'))):
+        m = _CSV_MONTH.search(os.path.basename(path))
+        if m:
+            months.setdefault(m.group(1), []).append(path)
+    for path in sorted(glob.glob(os.path.join(directory, 'parquet', 'date=*', 'process=*', 'data.parquet'))):
+        m = _PARQUET_MONTH.search(path)
+        if m:
+            months.setdefault(m.group(1), []).append(path)
+    return months
+
+
+def _read_source(path):
+    if path.endswith('.parquet'):
+        table = pq.read_table(path)
+    else:
+        # 종목코드는 앞자리 0 을 지키도록 문자열로, 시간은 타임스탬프로 읽는다
+        table = pa_csv.read_csv(
+            path,
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(column_types={'시간': pa.timestamp('us'), '종목코드': pa.string(),
+                                                                '종목명': pa.string(), '제목': pa.string(),
+                                                                '내용': pa.string(), '기사ID': pa.string(),
+                                                                '원본기사ID': pa.string()}),
+        )
+    table = table.cast(pa.schema([(f.name, pa.timestamp('us') if f.name == '시간' else pa.string())
+                                  for f in table.schema]))
+    # CSV 의 빈 원본기사ID/기사ID 는 Parquet 의 null 과 같은 값으로 맞춰 두 형식의 같은 행이 한 번만 남게 한다
+    for name in ('기사ID', '원본기사ID'):
+        if name in table.column_names:
+            column = table[name]
+            table = table.set_column(table.column_names.index(name), name,
+                                     pc.if_else(pc.equal(column, ''), pa.scalar(None, pa.string()), column))
+    return table
+
+
+def _conform(table, columns):
+    for column in columns:
+        if column not in table.column_names:
+            table = table.append_column(column, pa.nulls(table.num_rows, pa.string()))
+    return table.select(columns)
+
+
+def _sort_keys(columns):
+    # 종목 열이 있으면 종목코드 -> 시간 순. 한 종목의 한 주가 몇 개의 row group 에 모여 통계만으로 나머지를 건너뛴다
+    if '종목코드' in columns:
+        return [('종목코드', 'ascending'), ('시간', 'ascending')]
+    return [('시간', 'ascending')]
+
+
+def _fingerprint(paths):
+    return [[p, os.path.getsize(p), os.path.getmtime(p)] for p in paths]
+
+
+def compact_store(directory, store_dir=None, row_group_size=ROW_GROUP_SIZE):
+    # 흩어진 월별 출력 파일을 store_dir/month=YYYY-MM/data.parquet 하나씩으로 합친다.
+    # 같은 행은 한 번만 남기고, 원본 파일이 바뀌지 않은 월은 다시 쓰지 않는다 (_manifest.json)
+    store_dir = store_dir or os.path.join(directory, 'store')
+    os.makedirs(store_dir, exist_ok=True)
+    manifest_path = os.path.join(store_dir, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    written = 0
+    for month, paths in sorted(find_sources(directory).items()):
+        fingerprint = _fingerprint(paths)
+        if manifest.get(month, {}).get('sources') == fingerprint:
+            continue
+        started = time.time()
+        tables = [_read_source(p) for p in paths]
+        # 한 달 안에 열이 늘기 전과 후의 파일이 섞여 있으면 없는 열은 null 로 채운다
+        columns = [c for c in COLUMNS if any(c in t.column_names for t in tables)]
+        table = pa.concat_tables([_conform(t, columns) for t in tables]).combine_chunks()
+        table = table.group_by(columns).aggregate([]).select(columns)
+        table = table.sort_by(_sort_keys(columns))
+
+        part_dir = os.path.join(store_dir, f'month={month}')
+        os.makedirs(part_dir, exist_ok=True)
+        path = os.path.join(part_dir, 'data.parquet')
+        pq.write_table(table, path + '.tmp', row_group_size=row_group_size, compression='zstd', write_statistics=True)
+        os.replace(path + '.tmp', path)
+
+        times = table['시간']
+        manifest[month] = {
+            'rows': table.num_rows,
+            'min_time': str(pc.min(times).as_py()),
+            'max_time': str(pc.max(times).as_py()),
+            'columns': columns,
+            'sources': fingerprint,
+        }
+        with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(manifest_path + '.tmp', manifest_path)
+        written += 1
+        print(f"[Store] {month}: {table.num_rows} rows from {len(paths)} files -> {path} ({time.time() - started:.1f}s)")
+    print(f"[Store] Compacted {written} months into {store_dir}")
+    return store_dir
+
+
+def _to_datetime(value):
+    # 'YYYY-MM-DD', 'YYYY-MM-DD HH:MM', 'YYYY-MM-DD HH:MM:SS' (T 구분자도 된다)
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f"Invalid time {value!r}: use 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM[:SS]'") from None
+
+
+def _cli_time(value):
+    # 잘못된 --start/--end 는 traceback 대신 argparse 오류로 알린다. 날짜만 준 end 를 하루 끝까지로 보도록 문자열로 돌려준다
+    try:
+        _to_datetime(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+
+def _overlaps(stats, low, high):
+    # 통계가 없으면 읽어야 한다. low/high 가 None 이면 그쪽으로 열린 구간
+    if stats is None or not stats.has_min_max:
+        return True
+    return (low is None or stats.max >= low) and (high is None or stats.min <= high)
+
+
+class NewsStore:
+    # compact_store() 가 만든 월 파티션을 시간 구간과 종목으로 읽는다.
+    #   1) 월 파티션: 구간 밖의 month= 디렉터리는 열지 않는다
+    #   2) row group: 파일 footer 의 시간/종목코드 min/max 로 겹치지 않는 row group 은 읽지 않는다
+    #   3) 남은 row group 만 memory_map 으로 읽고 정확한 조건으로 한 번 더 거른다
+    # last_scan 에 마지막 조회에서 열어 본/읽은 파일과 row group 수를 남긴다.
+    def __init__(self, store_dir, memory_map=True):
+        self.store_dir = store_dir
+        self.memory_map = memory_map
+        self.last_scan = {}
+        self._files = {}
+
+    def months(self):
+        return sorted(os.path.basename(p)[len('month='):]
+                      for p in glob.glob(os.path.join(self.store_dir, 'month=*')))
+
+    def _file(self, month):
+        # footer(메타데이터)는 한 번만 읽어 둔다. 파일이 다시 쓰였으면 새로 연다
+        path = os.path.join(self.store_dir, f'month={month}', 'data.parquet')
+        mtime = os.path.getmtime(path)
+        cached = self._files.get(month)
+        if cached is None or cached[0] != mtime:
+            parquet_file = pq.ParquetFile(path, memory_map=self.memory_map)
+            names = parquet_file.schema_arrow.names
+            cached = self._files[month] = (mtime, parquet_file, {name: names.index(name) for name in names})
+        return cached[1], cached[2]
+
+    def query(self, start=None, end=None, codes=None, columns=None):
+        # start/end 는 datetime 또는 'YYYY-MM-DD[ HH:MM:SS]'. end 가 날짜만이면 그날 끝까지 포함한다
+        low = _to_datetime(start)
+        high = _to_datetime(end)
+        if isinstance(end, str) and len(end.strip()) == len('YYYY-MM-DD'):
+            high += timedelta(days=1) - timedelta(microseconds=1)
+        if isinstance(codes, str):
+            codes = [codes]
+        code_low, code_high = (min(codes), max(codes)) if codes else (None, None)
+
+        months = [m for m in self.months()
+                  if (low is None or m >= low.strftime('%Y-%m')) and (high is None or m <= high.strftime('%Y-%m'))]
+        scan = {'files': len(months), 'row_groups': 0, 'row_groups_read': 0, 'rows': 0}
+        tables = []
+        for month in months:
+            parquet_file, index = self._file(month)
+            if codes and '종목코드' not in index:
+                raise ValueError(f"{self.store_dir} has no 종목코드 column")
+            metadata = parquet_file.metadata
+            selected = []
+            for i in range(metadata.num_row_groups):
+                row_group = metadata.row_group(i)
+                if not _overlaps(row_group.column(index['시간']).statistics, low, high):
+                    continue
+                if codes and not _overlaps(row_group.column(index['종목코드']).statistics, code_low, code_high):
+                    continue
+                selected.append(i)
+            scan['row_groups'] += metadata.num_row_groups
+            scan['row_groups_read'] += len(selected)
+            if not selected:
+                continue
+            read_columns = None
+            if columns is not None:
+                read_columns = list(dict.fromkeys(list(columns) + ['시간'] + (['종목코드'] if codes else [])))
+            table = parquet_file.read_row_groups(selected, columns=read_columns)
+            mask = None
+            for condition in (
+                pc.greater_equal(table['시간'], pa.scalar(low, pa.timestamp('us'))) if low is not None else None,
+                pc.less_equal(table['시간'], pa.scalar(high, pa.timestamp('us'))) if high is not None else None,
+                pc.is_in(table['종목코드'], value_set=pa.array(codes, pa.string())) if codes else None,
+            ):
+                if condition is not None:
+                    mask = condition if mask is None else pc.and_(mask, condition)
+            if mask is not None:
+                table = table.filter(mask)
+            if columns is not None:
+                table = table.select(list(columns))
+            tables.append(table)
+
+        if not tables:
+            schema = pa.schema([(c, pa.timestamp('us') if c == '시간' else pa.string())
+                                for c in (columns or COLUMNS)])
+            table = schema.empty_table()
+        else:
+            table = pa.concat_tables(tables)
+        scan['rows'] = table.num_rows
+        self.last_scan = scan
+        return table
+
+    def query_df(self, start=None, end=None, codes=None, columns=None):
+        return self.query(start, end, codes, columns).to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compact scraper output into month-partitioned Parquet and query it')
+    sub = parser.add_subparsers(dest='command', required=True)
+    compact = sub.add_parser('compact', help='merge monthly CSV/Parquet output into <dir>/store')
+    compact.add_argument('directories', nargs='*', default=['data_news', 'data_news_all', 'data_news_tagged'])
+    query = sub.add_parser('query', help='read one stock / time range from a store')
+    query.add_argument('--store', default='data_news/store')
+    query.add_argument('--start', type=_cli_time, help="'YYYY-MM-DD' 또는 'YYYY-MM-DD HH:MM[:SS]'")
+    query.add_argument('--end', type=_cli_time, help='날짜만 주면 그날 끝까지 포함한다')
+    query.add_argument('--code', action='append', dest='codes')
+    query.add_argument('--columns', help="comma-separated, e.g. '시간,종목코드,제목'")
+    args = parser.parse_args()
+
+    if args.command == 'compact':
+        for directory in args.directories:
+            if os.path.isdir(directory):
+                compact_store(directory)
+        return
+
+    store = NewsStore(args.store)
+    started = time.perf_counter()
+    table = store.query(args.start, args.end, args.codes, args.columns.split(',') if args.columns else None)
+    elapsed = time.perf_counter() - started
+    print(table.select([c for c in table.column_names if c != '내용']).to_pandas().to_string(max_rows=20))
+    print(f"{table.num_rows} rows in {elapsed * 1000:.1f} ms. "
+          f"Read {store.last_scan['row_groups_read']}/{store.last_scan['row_groups']} row groups "
+          f"from {store.last_scan['files']} month files")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import multiprocessing
+import time
+
+
+class AdaptiveRateLimiter:
+    # 모든 워커가 공유 메모리의 요청 속도(rate, 초당 요청 수)와 다음 요청 시각(next_slot)을 함께 쓴다.
+    # 응답이 빠르고 정상이면 속도를 조금씩 올리고(additive increase),
+    # 429/5xx/연결 오류나 지연 증가가 보이면 모든 워커가 함께 속도를 줄이고 잠시 멈춘다(multiplicative decrease).
+    # 오류로 줄일 때는 최근 응답 중 실패 비율(error_ratio, 지수 이동 평균)에 맞춰 줄이고 멈춘다.
+    #   - 실패 비율이 error_threshold 이상이면 decrease 만큼 줄이고, 그보다 낮으면 그 비율만큼만 덜 줄인다
+    #   - 멈추는 시간은 penalty * 실패 비율. 드문드문 섞이는 503 에는 짧게, 대부분이 429 인 차단 상황에는 penalty 에 가깝게
+    # 줄이고 멈추는 것은 모두 cooldown 마다 한 번이다.
+    # Pool 의 initargs 로 넘기면 워커들이 같은 Value/Lock 을 물려받는다.
+    def __init__(self, initial_rate=2.0, min_rate=0.2, max_rate=10.0, increase=0.05, decrease=0.5,
+                 target_latency=2.0, penalty=5.0, cooldown=5.0, error_window=20, error_threshold=0.25):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.penalty = penalty
+        self.cooldown = cooldown
+        self.error_weight = 1.0 / error_window
+        self.error_threshold = error_threshold
+        self._rate = multiprocessing.Value('d', initial_rate, lock=False)
+        self._next_slot = multiprocessing.Value('d', 0.0, lock=False)
+        self._last_decrease = multiprocessing.Value('d', 0.0, lock=False)
+        self._error_ratio = multiprocessing.Value('d', 0.0, lock=False)
+        self._requests = multiprocessing.Value('q', 0, lock=False)
+        self._throttled = multiprocessing.Value('q', 0, lock=False)
+        self._lock = multiprocessing.Lock()
+
+    @property
+    def rate(self):
+        return self._rate.value
+
+    def reserve(self):
+        # 다음 요청 자리를 예약하고 기다려야 할 시간(초)을 돌려준다. 비동기 코드는 이 값만큼 await sleep 한다
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_slot.value)
+            self._next_slot.value = slot + 1.0 / self._rate.value
+            self._requests.value += 1
+        return slot - now
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def report(self, latency=None, status=None, error=False):
+        throttled = error or status == 429 or (status is not None and status >= 500)
+        slow = latency is not None and latency > self.target_latency
+        with self._lock:
+            now = time.time()
+            self._error_ratio.value += self.error_weight * ((1.0 if throttled else 0.0) - self._error_ratio.value)
+            if throttled:
+                self._throttled.value += 1
+            if throttled or slow:
+                # 같은 혼잡 신호로 여러 워커가 연달아 속도를 깎고 멈추지 않도록 cooldown 동안은 한 번만 줄인다
+                if now - self._last_decrease.value >= self.cooldown:
+                    # 지연 증가는 그대로, 오류는 실패 비율에 맞춰 줄인다
+                    severity = min(1.0, self._error_ratio.value / self.error_threshold) if throttled and not slow else 1.0
+                    self._rate.value = max(self.min_rate, self._rate.value * (1.0 - (1.0 - self.decrease) * severity))
+                    self._last_decrease.value = now
+                    if throttled:
+                        self._next_slot.value = max(self._next_slot.value, now + self.penalty * self._error_ratio.value)
+            else:
+                self._rate.value = min(self.max_rate, self._rate.value + self.increase)
+
+    def stats(self):
+        with self._lock:
+            return {'rate': self._rate.value, 'requests': self._requests.value, 'throttled': self._throttled.value,
+                    'error_ratio': round(self._error_ratio.value, 3)}
@@ -0,0 +1,121 @@
+from array import array
+from datetime import datetime, timedelta
+
+EPOCH = datetime(1970, 1, 1)
+STOCK_COLUMNS = ('종목명', '종목코드')
+ID_COLUMNS = ('기사ID', '원본기사ID')
+
+
+def to_epoch_us(dt):
+    # 시간대 없는(naive) datetime 을 그대로 1970-01-01 기준 마이크로초로 바꾼다
+    return (dt - EPOCH) // timedelta(microseconds=1)
+
+
+def from_epoch_us(value):
+    return EPOCH + timedelta(microseconds=value)
+
+
+class RecordBuffer:
+    # 행마다 dict 를 만드는 대신 열 배열로 보관한다.
+    #   시간     : array('q') 에 epoch 마이크로초
+    #   종목     : (종목코드, 종목명) 쌍을 한 번만 저장하고 행에는 int32 인덱스만 둔다
+    #   제목/내용 : 기사 ID(없으면 링크/제목) 당 한 번만 저장한다. 여러 종목에 걸린 기사도 본문은 하나다
+    #   기사ID/원본기사ID : 제목/내용과 같이 기사마다 한 번. 원본기사ID 는 근사 중복일 때만 있다 (아니면 None)
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.has_stock = all(c in self.columns for c in STOCK_COLUMNS)
+        self.times = array('q')
+        self.stocks = array('i')
+        self.articles = array('i')
+        self._stock_index = {}
+        self._stock_codes = []
+        self._stock_names = []
+        self._article_index = {}
+        self._titles = []
+        self._bodies = []
+        self._ids = []
+        self._dup_of = []
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, row, article_id=None):
+        key = article_id if article_id is not None else (row['제목'], row['내용'])
+        idx = self._article_index.get(key)
+        if idx is None:
+            idx = self._article_index[key] = len(self._titles)
+            self._titles.append(row['제목'])
+            self._bodies.append(row['내용'])
+            self._ids.append(row.get('기사ID', article_id))
+            self._dup_of.append(row.get('원본기사ID'))
+        self.articles.append(idx)
+        self.times.append(to_epoch_us(row['시간']))
+        if self.has_stock:
+            stock = (row['종목코드'], row['종목명'])
+            s = self._stock_index.get(stock)
+            if s is None:
+                s = self._stock_index[stock] = len(self._stock_codes)
+                self._stock_codes.append(stock[0])
+                self._stock_names.append(stock[1])
+            self.stocks.append(s)
+
+    def clear(self):
+        self.__init__(self.columns)
+
+    def _value(self, column, i):
+        if column == '시간':
+            return from_epoch_us(self.times[i])
+        if column == '제목':
+            return self._titles[self.articles[i]]
+        if column == '내용':
+            return self._bodies[self.articles[i]]
+        if column == '기사ID':
+            return self._ids[self.articles[i]]
+        if column == '원본기사ID':
+            return self._dup_of[self.articles[i]]
+        if column == '종목코드':
+            return self._stock_codes[self.stocks[i]]
+        return self._stock_names[self.stocks[i]]
+
+    def order(self, reverse=True):
+        # 시간 역순(같은 시각은 들어온 순서) 행 번호
+        return sorted(range(len(self.times)), key=self.times.__getitem__, reverse=reverse)
+
+    def rows(self, indices=None):
+        # columns 순서의 튜플. CSV writer 에 그대로 넘긴다
+        if indices is None:
+            indices = range(len(self.times))
+        for i in indices:
+            yield tuple(self._value(c, i) for c in self.columns)
+
+    def to_arrow(self, indices=None, dictionary=True):
+        # 시간/종목/기사 인덱스는 array 버퍼를 복사 없이 Arrow 버퍼로 감싼다.
+        # 제목/내용/종목은 고유 값만 담은 사전(dictionary) 배열이라 같은 본문이 행마다 복제되지 않는다.
+        import pyarrow as pa
+
+        n = len(self.times)
+        times = pa.Array.from_buffers(pa.timestamp('us'), n, [None, pa.py_buffer(self.times)])
+        articles = pa.Array.from_buffers(pa.int32(), n, [None, pa.py_buffer(self.articles)])
+        arrays = {
+            '시간': times,
+            '제목': pa.DictionaryArray.from_arrays(articles, pa.array(self._titles, pa.string())),
+            '내용': pa.DictionaryArray.from_arrays(articles, pa.array(self._bodies, pa.string())),
+            '기사ID': pa.DictionaryArray.from_arrays(articles, pa.array(self._ids, pa.string())),
+            '원본기사ID': pa.array(self._dup_of, pa.string()).take(articles),
+        }
+        if self.has_stock:
+            stocks = pa.Array.from_buffers(pa.int32(), n, [None, pa.py_buffer(self.stocks)])
+            arrays['종목코드'] = pa.DictionaryArray.from_arrays(stocks, pa.array(self._stock_codes, pa.string()))
+            arrays['종목명'] = pa.DictionaryArray.from_arrays(stocks, pa.array(self._stock_names, pa.string()))
+        table = pa.table({c: arrays[c] for c in self.columns})
+        if indices is not None:
+            table = table.take(pa.array(indices, pa.int64()))
+        if not dictionary:
+            # 기존 Parquet 파일과 스키마를 맞출 때는 일반 string 열로 푼다
+            table = table.cast(pa.schema([(f.name, f.type.value_type if pa.types.is_dictionary(f.type) else f.type)
+                                          for f in table.schema]))
+        return table
+
+    def to_pandas(self):
+        # 사전 배열은 pandas Categorical 이 되어 고유 문자열만 메모리에 남는다
+        return self.to_arrow().to_pandas()
@@ -0,0 +1,205 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 초 단위 히스토그램 경계. 파싱(ms)부터 네트워크 대기/슬립(수십 초)까지 한 벌로 덮는다
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# 다른 단계 안에서 재는 단계. 바깥 단계의 시간에 이미 들어 있으므로 요약에서 따로 적는다
+NESTED = {
+    'throttle': 'summed per-request waits inside get/get_many; concurrent async waits overlap, so this is not wall time',
+    'match': 'inside parse_news',
+}
+
+
+class Metrics:
+    # 워커마다 하나. 단계별 소요 시간 히스토그램과 카운터를 모은다.
+    # drain() 으로 스냅샷(dict)을 꺼내 run_day 결과에 실어 보내면 부모 프로세스가 merge() 로 합친다.
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, stage, seconds):
+        hist = self.histograms.get(stage)
+        if hist is None:
+            hist = self.histograms[stage] = {'buckets': [0] * (len(BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist['buckets'][i] += 1
+                break
+        else:
+            hist['buckets'][-1] += 1
+        hist['sum'] += seconds
+        hist['count'] += 1
+
+    @contextmanager
+    def timer(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def snapshot(self):
+        return {
+            'counters': dict(self.counters),
+            'histograms': {k: {'buckets': list(v['buckets']), 'sum': v['sum'], 'count': v['count']}
+                           for k, v in self.histograms.items()},
+        }
+
+    def drain(self):
+        snap = self.snapshot()
+        self.counters = {}
+        self.histograms = {}
+        return snap
+
+    def merge(self, snap):
+        for name, n in snap['counters'].items():
+            self.count(name, n)
+        for stage, other in snap['histograms'].items():
+            hist = self.histograms.get(stage)
+            if hist is None:
+                hist = self.histograms[stage] = {'buckets': [0] * (len(BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+            hist['buckets'] = [a + b for a, b in zip(hist['buckets'], other['buckets'])]
+            hist['sum'] += other['sum']
+            hist['count'] += other['count']
+
+    def quantile(self, stage, q):
+        # 버킷 경계로 근사한 분위수 (Prometheus histogram_quantile 과 같은 방식의 상한값)
+        hist = self.histograms.get(stage)
+        if not hist or not hist['count']:
+            return None
+        target = q * hist['count']
+        seen = 0
+        for bound, n in zip(BUCKETS + (float('inf'),), hist['buckets']):
+            seen += n
+            if seen >= target:
+                return bound
+        return float('inf')
+
+
+def rates(metrics, elapsed):
+    c = metrics.counters
+    requests = c.get('requests', 0)
+    return {
+        'elapsed_seconds': elapsed,
+        'pages_per_sec': c.get('pages', 0) / elapsed if elapsed else 0.0,
+        'articles_per_sec': c.get('articles', 0) / elapsed if elapsed else 0.0,
+        'retry_rate': c.get('retries', 0) / requests if requests else 0.0,
+    }
+
+
+def to_prometheus(metrics, elapsed, prefix='naver_news'):
+    lines = []
+    for name, value in sorted(metrics.counters.items()):
+        lines.append(f'# TYPE {prefix}_{name}_total counter')
+        lines.append(f'{prefix}_{name}_total {value}')
+    if metrics.histograms:
+        lines.append(f'# TYPE {prefix}_stage_seconds histogram')
+    for stage, hist in sorted(metrics.histograms.items()):
+        cumulative = 0
+        for bound, n in zip(BUCKETS + (float('inf'),), hist['buckets']):
+            cumulative += n
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+        lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {hist["sum"]}')
+        lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {hist["count"]}')
+    for name, value in rates(metrics, elapsed).items():
+        lines.append(f'# TYPE {prefix}_{name} gauge')
+        lines.append(f'{prefix}_{name} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsExporter:
+    # 부모 프로세스에서 워커 스냅샷을 합치고, interval 초마다 JSON 스냅샷과 Prometheus 텍스트 파일을 쓴다.
+    # port 를 주면 같은 내용을 http://localhost:port/metrics 로도 내보낸다.
+    def __init__(self, json_path=None, prom_path=None, interval=30.0, port=None):
+        self.metrics = Metrics()
+        self.json_path = json_path
+        self.prom_path = prom_path
+        self.interval = interval
+        self.started = time.time()
+        self.last_write = 0.0
+        self.lock = threading.Lock()
+        self.server = None
+        if port is not None:
+            self._serve(port)
+
+    def _serve(self, port):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = exporter.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def prometheus(self):
+        with self.lock:
+            return to_prometheus(self.metrics, time.time() - self.started)
+
+    @contextmanager
+    def timer(self, stage):
+        # 부모 프로세스에서 도는 단계(월 병합 등)를 직접 잰다
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.metrics.observe(stage, time.perf_counter() - started)
+
+    def update(self, snap):
+        with self.lock:
+            self.metrics.merge(snap)
+        if time.time() - self.last_write >= self.interval:
+            self.write()
+
+    def write(self):
+        self.last_write = time.time()
+        with self.lock:
+            elapsed = self.last_write - self.started
+            data = dict(self.metrics.snapshot(), rates=rates(self.metrics, elapsed), written_at=self.last_write)
+            prom = to_prometheus(self.metrics, elapsed)
+        for path, text in ((self.json_path, json.dumps(data, ensure_ascii=False, indent=2)), (self.prom_path, prom)):
+            if path is None:
+                continue
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(path + '.tmp', path)
+
+    def summary(self):
+        # 바깥 단계는 워커마다 겹치지 않는 wall time 이고, 워커 수만큼 더해진다. 안쪽 단계(NESTED)는 따로 적는다
+        with self.lock:
+            r = rates(self.metrics, time.time() - self.started)
+            ordered = sorted(self.metrics.histograms.items(), key=lambda kv: -kv[1]['sum'])
+            stages = ', '.join(f"{stage} {hist['sum']:.1f}s (p95 <= {self.metrics.quantile(stage, 0.95)}s)"
+                               for stage, hist in ordered if stage not in NESTED)
+            nested = ', '.join(f"{stage} {hist['sum']:.1f}s ({NESTED[stage]})"
+                               for stage, hist in ordered if stage in NESTED)
+        text = (f"{r['pages_per_sec']:.2f} pages/s, {r['articles_per_sec']:.2f} articles/s, "
+                f"retry rate {r['retry_rate']:.1%}. Time by stage, summed over workers: {stages}")
+        if nested:
+            text += f". Already counted above: {nested}"
+        return text
+
+    def close(self):
+        self.write()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server = None
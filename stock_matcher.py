@@ -0,0 +1,76 @@
+from collections import deque
+
+
+class StockMatcher:
+    # 종목코드/종목명 전체를 하나의 Aho-Corasick 오토마톤으로 만들어 제목을 한 번만 훑는다.
+    # longest_match=True 이면 더 긴 종목명에 포함된 짧은 종목명(예: '삼성' ⊂ '삼성전자')은 버린다.
+    def __init__(self, stock_codes, stock_names, longest_match=False):
+        self.stock_codes = list(stock_codes)
+        self.stock_names = list(stock_names)
+        self.longest_match = longest_match
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for idx, (code, name) in enumerate(zip(self.stock_codes, self.stock_names)):
+            for pattern in {code, name}:
+                if pattern:
+                    self._add(pattern, idx)
+        self._build()
+
+    def _add(self, pattern, idx):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), idx))
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                f = self._goto[f].get(ch, 0)
+                self._fail[nxt] = f if f != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _scan(self, text):
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, idx in out[state]:
+                yield pos - length + 1, pos + 1, idx
+
+    def find(self, text):
+        hits = list(self._scan(text))
+        if not hits:
+            return []
+
+        if self.longest_match:
+            spans = sorted(hits, key=lambda h: (h[0], -(h[1] - h[0])))
+            kept = []
+            covered_end = -1
+            for start, end, idx in spans:
+                if end <= covered_end:
+                    continue
+                kept.append((start, end, idx))
+                covered_end = max(covered_end, end)
+            hits = kept
+
+        # 기존 zip 루프와 같은 순서(상장 목록 순)로, 종목당 한 번만 돌려준다
+        indices = sorted({idx for _, _, idx in hits})
+        return [(self.stock_codes[i], self.stock_names[i]) for i in indices]
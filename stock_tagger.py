@@ -0,0 +1,112 @@
+import glob
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+
+from stock_matcher import StockMatcher
+from stock_universe import DEFAULT_PATH as UNIVERSE_PATH, DEFAULT_TTL_HOURS, load_universe
+
+# news_scalping.py 가 쓰는 것과 같은 스키마. 입력에 기사ID/원본기사ID 가 있으면 그대로 옮긴다
+COLUMNS = ['시간', '종목명', '종목코드', '제목', '내용']
+ID_COLUMNS = ['기사ID', '원본기사ID']
+
+_matcher = None
+_settings = None
+
+
+def tag_frame(df, matcher, include_body=False):
+    # news_all 행(시간, 제목, 내용)에 종목을 붙인다. 같은 제목/본문은 한 번만 오토마톤으로 훑고,
+    # 결과는 NumPy 인덱스 배열로 행 전체에 한꺼번에 펼친다. 종목이 여러 개면 행도 여러 개가 된다.
+    titles = df['제목'].fillna('').astype(str)
+    uniq, inverse = np.unique(titles.to_numpy(dtype=object), return_inverse=True)
+    found = [matcher.find(t) for t in uniq]
+    matches = [found[i] for i in inverse]
+
+    if include_body:
+        bodies = df['내용'].fillna('').astype(str)
+        uniq, inverse = np.unique(bodies.to_numpy(dtype=object), return_inverse=True)
+        body_found = [matcher.find(b) for b in uniq]
+        # 제목에서 찾은 종목을 먼저, 본문에서만 찾은 종목은 상장 목록 순으로 그 뒤에 둔다
+        matches = [m + [s for s in body_found[i] if s not in m] for m, i in zip(matches, inverse)]
+
+    counts = np.fromiter((len(m) for m in matches), dtype=np.int64, count=len(matches))
+    rows = np.repeat(np.arange(len(df)), counts)
+    pairs = [pair for m in matches for pair in m]
+
+    out = df.iloc[rows].reset_index(drop=True)
+    out['종목코드'] = [code for code, _ in pairs]
+    out['종목명'] = [name for _, name in pairs]
+    return out[COLUMNS + [c for c in ID_COLUMNS if c in df.columns]]
+
+
+def output_path(path, input_dir, output_dir):
+    # data_news_all/news_all_..._proc_N.csv -> data_news_tagged/news_tagged_..._proc_N.csv (Parquet 은 파티션 경로를 그대로 둔다).
+    # 종목 크롤링의 출력(data_news/news_..._proc_N.csv)과 이름이 겹치면 그 파일을 덮어쓰고,
+    # 그 달의 크롤링이 끝날 때 CsvSink.compact 가 태깅 결과에 이어 붙이므로 디렉터리와 접두어를 따로 둔다
+    relative = os.path.relpath(path, input_dir)
+    head, name = os.path.split(relative)
+    if name.startswith('news_all_'):
+        name = 'news_tagged_' + name[len('news_all_'):]
+    return os.path.join(output_dir, head, name)
+
+
+def init_worker(settings):
+    global _matcher, _settings
+    # 부모가 갱신해 둔 상장 목록 캐시에서 워커가 직접 오토마톤을 만든다
+    stock_codes, stock_names = load_universe(settings['market'], settings['universe_path'], offline=True)
+    _matcher = StockMatcher(stock_codes, stock_names, longest_match=False)
+    _settings = settings
+
+
+def tag_file(path):
+    target = output_path(path, _settings['input_dir'], _settings['output_dir'])
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+        tagged = tag_frame(df, _matcher, _settings['include_body'])
+        tagged.to_parquet(target + '.tmp', index=False)
+    else:
+        # 시간 문자열을 그대로 옮기도록 모든 열을 문자열로 읽는다
+        df = pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+        tagged = tag_frame(df, _matcher, _settings['include_body'])
+        tagged.to_csv(target + '.tmp', index=False, encoding='utf-8-sig')
+    os.replace(target + '.tmp', target)
+    print(f"[Process {multiprocessing.current_process().name}] Tagged {len(tagged)} rows from {len(df)} articles: {target}")
+    return len(df), len(tagged)
+
+
+def find_inputs(input_dir):
+    files = sorted(glob.glob(os.path.join(input_dir, 'news_all_*.csv')))
+    files += sorted(glob.glob(os.path.join(input_dir, 'parquet', 'date=*', 'process=*', 'data.parquet')))
+    return files
+
+
+def main():
+    settings = {
+        'input_dir': 'data_news_all',
+        'output_dir': 'data_news_tagged',
+        'include_body': False,  # True 면 본문에 나온 종목도 붙인다 (크롤링 시점 필터는 제목만 본다)
+        'market': 'KOSPI',
+        'universe_path': UNIVERSE_PATH,
+    }
+    load_universe(settings['market'], settings['universe_path'], DEFAULT_TTL_HOURS)
+    files = find_inputs(settings['input_dir'])
+    if not files:
+        print(f"No news_all output found under {settings['input_dir']}")
+        return
+
+    max_processes = min(6, len(files))
+    with multiprocessing.Pool(processes=max_processes, initializer=init_worker,
+                              initargs=(settings,)) as pool:
+        results = pool.map(tag_file, files, chunksize=1)
+        pool.close()
+        pool.join()
+
+    articles = sum(r[0] for r in results)
+    rows = sum(r[1] for r in results)
+    print(f"Tagged {len(files)} files: {articles} articles -> {rows} stock rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import json
+import os
+import time
+
+# 캐시 파일 형식이 바뀌면 올린다. 버전이 다른 캐시는 없는 것으로 보고 새로 받는다
+VERSION = 1
+DEFAULT_PATH = 'data_news/stock_universe.json'
+DEFAULT_TTL_HOURS = 24.0
+MARKETS = ('KOSPI', 'KOSDAQ', 'KRX')
+
+
+def _read(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if data.get('version') == VERSION else None
+
+
+def _write(path, data):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+
+def _fetch(market):
+    # pandas/FinanceDataReader 는 상장 목록을 새로 받을 때만 import 한다
+    import FinanceDataReader as fdr
+    df = fdr.StockListing(market)
+    return df['Code'].astype(str).tolist(), df['Name'].astype(str).tolist()
+
+
+def load_universe(market='KOSPI', path=DEFAULT_PATH, ttl_hours=DEFAULT_TTL_HOURS, offline=False):
+    # (종목코드 목록, 종목명 목록). 캐시가 ttl 안이면 그대로 쓰고, 지났으면 새로 받아 저장한다.
+    # 받지 못하면(네트워크 없음 등) 오래된 캐시라도 쓴다. offline=True 면 네트워크를 아예 쓰지 않는다
+    cached = _read(path)
+    entry = cached['markets'].get(market) if cached else None
+    if entry is not None and (offline or time.time() - entry['fetched_at'] < ttl_hours * 3600):
+        return entry['codes'], entry['names']
+
+    if not offline:
+        try:
+            codes, names = _fetch(market)
+        except Exception as e:
+            print(f"[Universe] Failed to refresh the {market} listing: {e}")
+        else:
+            data = cached or {'version': VERSION, 'markets': {}}
+            data['markets'][market] = {'fetched_at': time.time(), 'codes': codes, 'names': names}
+            _write(path, data)
+            print(f"[Universe] Cached {len(codes)} {market} stocks in {path}")
+            return codes, names
+
+    if entry is None:
+        raise RuntimeError(f"No cached {market} listing in {path} and it could not be fetched")
+    age = (time.time() - entry['fetched_at']) / 3600
+    print(f"[Universe] Using the cached {market} listing from {age:.1f} hours ago")
+    return entry['codes'], entry['names']